@@ -11,6 +11,15 @@ from PIL import Image
 import io
 import hashlib
 
+# scrapy가 scrapy.cfg 디렉터리(수집기 디렉터리)를 sys.path에 추가
+from io_utils import WRITE_BUFFER
+
+# pybloomfiltermmap3가 있으면 ICON_DEDUPE_BLOOM 설정 시 중복 검사에 Bloom 필터 사용 (항목당 수 바이트)
+try:
+    from pybloomfilter import BloomFilter
+except ImportError:
+    BloomFilter = None
+
 class AWSIconPipeline:
     """
     AWS 아이콘 데이터 처리 파이프라인
@@ -18,15 +27,27 @@ class AWSIconPipeline:
     수집된 아이콘 데이터를 검증하고 필터링하여 고품질 데이터만 저장합니다.
     """
     
-    def __init__(self):
+    def __init__(self, bloom_dedupe: bool = False, dedupe_capacity: int = 10_000):
+        """
+        초기화
+        
+        Args:
+            bloom_dedupe: True면 정확한 해시 집합 대신 Bloom 필터 사용 (pybloomfiltermmap3 필요)
+            dedupe_capacity: Bloom 필터 예상 항목 수 (초과하면 오탐률이 계속 증가)
+        """
         self.output_dir = Path("collected_icons")
         self.output_dir.mkdir(exist_ok=True)
         
         # 수집된 아이콘 저장소
         self.collected_icons = []
         
-        # 중복 제거를 위한 해시 저장소
-        self.seen_hashes = set()
+        # 중복 제거를 위한 해시 저장소 (MD5 원시 16바이트 다이제스트)
+        # Bloom 필터는 오탐률 0.1%로 중복이 아닌 아이콘을 드물게 버릴 수 있고 크기가
+        # 늘지 않으므로, 기본값은 정확한 집합 (이 규모의 수집에서는 메모리 부담이 작음)
+        if BloomFilter is not None and bloom_dedupe:
+            self.seen_hashes = BloomFilter(capacity=dedupe_capacity, error_rate=0.001)
+        else:
+            self.seen_hashes = set()
         
         # 품질 기준
         self.min_file_size = 1000  # 1KB
@@ -34,6 +55,15 @@ class AWSIconPipeline:
         self.max_file_size = 10 * 1024 * 1024  # 10MB
         self.max_dimensions = (1024, 1024)  # 최대 1024x1024
     
+    @classmethod
+    def from_crawler(cls, crawler):
+        """Scrapy 설정(ICON_DEDUPE_BLOOM, ICON_DEDUPE_CAPACITY)으로 생성"""
+        settings = crawler.settings
+        return cls(
+            bloom_dedupe=settings.getbool("ICON_DEDUPE_BLOOM", False),
+            dedupe_capacity=settings.getint("ICON_DEDUPE_CAPACITY", 10_000),
+        )
+    
     def process_item(self, item: Dict[str, Any], spider) -> Dict[str, Any]:
         """아이템 처리"""
         try:
@@ -95,15 +125,15 @@ class AWSIconPipeline:
             if not file_path.exists():
                 return True
             
-            # 파일 해시 계산
+            # 파일 해시 계산 (저장소에는 16진 문자열 대신 원시 다이제스트 보관)
             with open(file_path, 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
+                digest = hashlib.md5(f.read()).digest()
             
-            if file_hash in self.seen_hashes:
+            if digest in self.seen_hashes:
                 return True
             
-            self.seen_hashes.add(file_hash)
-            item['file_hash'] = file_hash
+            self.seen_hashes.add(digest)
+            item['file_hash'] = digest.hex()
             
             return False
             
@@ -170,7 +200,7 @@ class AWSIconPipeline:
         
         # JSON 파일로 저장
         output_file = self.output_dir / f"high_quality_icons_{timestamp}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
             json.dump(icons, f, ensure_ascii=False, indent=2)
         
         # CSV 파일로도 저장
@@ -185,7 +215,7 @@ class AWSIconPipeline:
         """CSV 형식으로 저장"""
         import csv
         
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+        with open(csv_file, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER) as f:
             if not icons:
                 return
             
@@ -194,9 +224,8 @@ class AWSIconPipeline:
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
             
-            # 데이터 작성
-            for icon in icons:
-                writer.writerow(icon)
+            # 데이터 작성 (한 번의 writerows 호출)
+            writer.writerows(icons)
     
     def print_statistics(self, icons: list):
         """통계 출력"""
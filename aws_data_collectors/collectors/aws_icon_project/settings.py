@@ -63,6 +63,11 @@ ITEM_PIPELINES = {
     "aws_icon_project.pipelines.AWSIconPipeline": 300,
 }
 
+# AWSIconPipeline 중복 검사: 기본은 정확한 해시 집합,
+# True면 pybloomfiltermmap3 Bloom 필터(오탐률 0.1%, ICON_DEDUPE_CAPACITY 초과 시 오탐 증가) 사용
+ICON_DEDUPE_BLOOM = False
+ICON_DEDUPE_CAPACITY = 10000
+
 # Enable and configure the AutoThrottle extension (disabled by default)
 # See https://docs.scrapy.org/en/latest/topics/autothrottle.html
 AUTOTHROTTLE_ENABLED = True
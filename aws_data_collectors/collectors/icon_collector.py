@@ -4,15 +4,26 @@ AWS 공식 아이콘 ZIP 파일을 파싱하여 매핑 파일을 생성합니다
 """
 
 import csv
-import json
+import mmap
+import os
 import pathlib
 import re
+import sys
 import zipfile
-from collections import defaultdict
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from collections import Counter, defaultdict
+from typing import Iterable, List, Dict, Tuple, Optional
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 
-@dataclass
+import orjson
+
+try:
+    from .io_utils import cache_file_path, load_pickle_cache, resolve_cache_dir, save_pickle_cache
+except ImportError:  # 수집기 디렉터리에서 최상위 모듈로 import한 경우
+    from io_utils import cache_file_path, load_pickle_cache, resolve_cache_dir, save_pickle_cache
+
+@dataclass(slots=True)
 class IconMapping:
     """아이콘 매핑 데이터 클래스"""
     group: str
@@ -23,6 +34,10 @@ class IconMapping:
     size: Optional[str] = None
     theme: Optional[str] = None
 
+# 직렬화용 필드명/행 추출기 (CSV 헤더 및 JSON 키 순서)
+_MAPPING_FIELDS = tuple(f.name for f in fields(IconMapping))
+_mapping_row = attrgetter(*_MAPPING_FIELDS)
+
 class AWSIconCollector:
     """
     AWS 아이콘 수집기
@@ -37,9 +52,21 @@ class AWSIconCollector:
     ```
     """
     
-    def __init__(self):
+    # 파싱 규칙이 바뀌면 올려서 이전 캐시를 무효화
+    CACHE_VERSION = 1
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 파싱 결과 캐시 디렉터리 (기본값: ~/.cache/aws-archlens)
+        """
+        self.cache_dir = resolve_cache_dir(cache_dir)
+        
         # 정규식 패턴
         self.suffix_pattern = re.compile(r"(_?(Dark|Light))?(_?\d{2})?(\.svg|\.png)$", re.I)
+        self.spaces_pattern = re.compile(r"\s+")
         
         # ZIP 구조 상 고정된 루트
         self.res_root_hint = "Resource-Icons_"
@@ -59,10 +86,15 @@ class AWSIconCollector:
             "Quantum Technologies": "Quantum Technologies",
             "Migration Modernization": "Migration & Modernization",
         }
+        
+        # 그룹 폴더명(수십 종)과 서비스 파일명은 테마/사이즈별로 반복되므로
+        # 인스턴스 단위로 정규화 결과를 캐시
+        self.normalize_group = lru_cache(maxsize=256)(self.normalize_group)
+        self.normalize_service_from_file = lru_cache(maxsize=4096)(self.normalize_service_from_file)
     
     def normalize_spaces(self, s: str) -> str:
         """공백 정규화"""
-        return re.sub(r"\s+", " ", s).strip()
+        return self.spaces_pattern.sub(" ", s).strip()
     
     def normalize_group(self, folder_name: str) -> Optional[str]:
         """폴더명을 그룹명으로 정규화"""
@@ -79,10 +111,9 @@ class AWSIconCollector:
         if s.startswith(self.service_file_prefix):
             s = s[len(self.service_file_prefix):]
         # 서비스 기본명은 첫 '_' 이전
+        # (파일명 서비스 부분에는 연속 공백이 없으므로 정규식 없이 strip만 수행)
         base = s.split("_", 1)[0]
-        base = base.replace("-", " ")
-        base = self.normalize_spaces(base)
-        return base
+        return base.replace("-", " ").strip()
     
     def extract_icon_metadata(self, file_path: str) -> Dict[str, Optional[str]]:
         """파일 경로에서 아이콘 메타데이터 추출"""
@@ -110,9 +141,49 @@ class AWSIconCollector:
         }
     
     def is_icon_file(self, file_path: str) -> bool:
-        """아이콘 파일인지 확인"""
-        p = file_path.lower()
-        return p.endswith((".svg", ".png"))
+        """아이콘 파일인지 확인 (확장자 4글자만 소문자화해 전체 경로 복사 방지)"""
+        return file_path[-4:].lower() in (".svg", ".png")
+    
+    def parse_entry(self, file_path: str) -> Optional[Tuple[str, str, str]]:
+        """
+        ZIP 항목 하나를 (경로, 그룹, 서비스)로 해석
+        
+        Args:
+            file_path: ZIP 내부 경로
+            
+        Returns:
+            Optional[Tuple[str, str, str]]: 리소스 아이콘이 아니거나 잡음이면 None
+        """
+        # 리소스 아이콘만 사용 (힌트에 '/'가 없으므로 전체 경로 부분 문자열 검사와 동일,
+        # 아키텍처/카테고리 아이콘 대부분을 분리 전에 걸러냄)
+        if self.res_root_hint not in file_path:
+            return None
+        if not self.is_icon_file(file_path):
+            return None
+        
+        # ZIP 경로는 항상 '/' 구분이므로 PurePosixPath 생성 없이 분리
+        parts = file_path.split("/")
+        
+        if len(parts) < 3:
+            return None
+        
+        group_folder = parts[-2]  # e.g., "Res_Security-Identity-Compliance"
+        service_file = parts[-1]  # e.g., "Res_Amazon-EC2_Instance_48.svg"
+        
+        # macOS 리소스 포크(__MACOSX/._Res_*) 제외
+        if service_file.startswith("._"):
+            return None
+        
+        group = self.normalize_group(group_folder)
+        stem = self.suffix_pattern.sub("", service_file)  # 사이즈/테마/확장자 제거 (한 번에)
+        
+        service = self.normalize_service_from_file(stem)
+        
+        # 잡음/유틸 제거
+        if len(service) < 2 or service.lower() in {"learn more", "pricing", "faq"}:
+            return None
+        
+        return file_path, group or "", service
     
     def collect_icons(self, zip_path: str) -> List[IconMapping]:
         """
@@ -124,60 +195,79 @@ class AWSIconCollector:
         Returns:
             List[IconMapping]: 아이콘 매핑 정보 리스트
         """
+        # 같은 ZIP(크기+수정 시각 기준)을 다시 파싱하는 경우 캐시된 결과 사용
+        cache_path = self._cache_path(zip_path)
+        mappings = self._load_cache(cache_path)
+        if mappings is not None:
+            print(f"♻️ 캐시된 아이콘 매핑 사용: {cache_path}")
+            return mappings
+        
+        mappings = self._parse_zip(zip_path)
+        self._save_cache(cache_path, mappings)
+        return mappings
+    
+    def _parse_zip(self, zip_path: str) -> List[IconMapping]:
+        """ZIP 중앙 디렉터리를 읽어 매핑 생성 (캐시 미사용)"""
+        # 본문은 압축 해제하지 않고 중앙 디렉터리만 읽으므로 파일을 메모리 맵으로 열어
+        # 커널→사용자 버퍼 복사 없이 파싱 (Asset-Package는 ZIP64일 수 있으므로 명시적으로 허용)
+        with open(zip_path, "rb") as raw, \
+                mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                zipfile.ZipFile(mm, "r", allowZip64=True) as z:
+            infos = z.infolist()
+        
+        # 이름 목록을 따로 만들지 않고 ZipInfo를 바로 순회
+        names = (info.filename for info in infos)
+        return self._build_mappings(map(self.parse_entry, names))
+    
+    def _cache_path(self, zip_path: str) -> pathlib.Path:
+        """ZIP 크기/수정 시각으로 만든 캐시 파일 경로"""
+        st = os.stat(zip_path)
+        return cache_file_path(self.cache_dir, "icons", self.CACHE_VERSION, st.st_size, int(st.st_mtime))
+    
+    @staticmethod
+    def _load_cache(cache_path: pathlib.Path) -> Optional[List[IconMapping]]:
+        """캐시 파일 로드 (없거나 손상되었으면 None)"""
+        return load_pickle_cache(cache_path, "아이콘 매핑 캐시")
+    
+    @staticmethod
+    def _save_cache(cache_path: pathlib.Path, mappings: List[IconMapping]) -> None:
+        """캐시 파일 저장 (실패해도 수집은 계속)"""
+        save_pickle_cache(cache_path, mappings, "아이콘 매핑 캐시")
+    
+    def _build_mappings(self, parsed: Iterable[Optional[Tuple[str, str, str]]]) -> List[IconMapping]:
+        """해석된 항목에서 중복을 제거하며 매핑 생성 (그룹/카테고리/서비스 기준 첫 항목 유지)"""
         mappings = []
+        seen = set()
         
-        with zipfile.ZipFile(zip_path) as z:
-            names = z.namelist()
+        for row in parsed:
+            if row is None:
+                continue
+            file_path, group, service = row
+            # 같은 서비스의 서로 다른 파일명에서 값은 같지만 별개인 문자열이 만들어지므로
+            # intern해 매핑 간 같은 객체를 공유 (그룹은 lru_cache된 normalize_group 결과라 이미 공유됨)
+            service = sys.intern(service)
             
-            for file_path in names:
-                if not self.is_icon_file(file_path):
-                    continue
-                
-                parts = pathlib.PurePosixPath(file_path).parts
-                if not any(self.res_root_hint in p for p in parts):
-                    continue  # 리소스 아이콘만 사용
-                
-                if len(parts) < 3:
-                    continue
-                
-                group_folder = parts[-2]  # e.g., "Res_Security-Identity-Compliance"
-                service_file = parts[-1]  # e.g., "Res_Amazon-EC2_Instance_48.svg"
-                
-                group = self.normalize_group(group_folder)
-                metadata = self.extract_icon_metadata(file_path)
-                stem = self.suffix_pattern.sub("", service_file)  # 사이즈/테마/확장자 제거
-                stem = stem.rsplit(".", 1)[0] if "." in stem else stem
-                
-                service = self.normalize_service_from_file(stem)
-                
-                # 잡음/유틸 제거
-                if len(service) < 2 or service.lower() in {"learn more", "pricing", "faq"}:
-                    continue
-                
-                mapping = IconMapping(
-                    group=group or "",
-                    category=None,
-                    service=service,
-                    zip_path=file_path,
-                    file_name=metadata["file_name"],
-                    size=metadata["size"],
-                    theme=metadata["theme"]
-                )
-                mappings.append(mapping)
-        
-        # 중복 제거
-        seen = set()
-        unique_mappings = []
-        for mapping in mappings:
-            key = (mapping.group, mapping.category, mapping.service)
-            if key not in seen:
-                seen.add(key)
-                unique_mappings.append(mapping)
+            key = (group, None, service)
+            if key in seen:
+                continue
+            seen.add(key)
+            
+            metadata = self.extract_icon_metadata(file_path)
+            mapping = IconMapping(
+                group=group,
+                category=None,
+                service=service,
+                zip_path=file_path,
+                file_name=metadata["file_name"],
+                size=metadata["size"],
+                theme=metadata["theme"]
+            )
+            mappings.append(mapping)
         
-        return unique_mappings
+        return mappings
     
     def save_mappings(self, mappings: List[IconMapping], 
-                     csv_path: str, json_path: str) -> None:
+                     csv_path: str, json_path: str, pretty: bool = True) -> None:
         """
         매핑 정보를 CSV와 JSON 파일로 저장
         
@@ -185,37 +275,43 @@ class AWSIconCollector:
             mappings: 아이콘 매핑 정보 리스트
             csv_path: CSV 출력 파일 경로
             json_path: JSON 출력 파일 경로
+            pretty: JSON 들여쓰기 여부 (False면 구분자 공백 없이 압축 저장)
         """
-        # CSV 저장
+        rows = [["" if v is None else v for v in _mapping_row(m)] for m in mappings]
+        
+        # CSV 저장 (그룹/서비스/경로는 AWS가 정한 문자열이라 인용이 필요 없으므로
+        # 한 번에 이어 붙여 기록, 특수문자가 있으면 csv.writer로 대체)
+        lines = [",".join(row) for row in rows]
+        needs_quoting = any(
+            line.count(",") != len(_MAPPING_FIELDS) - 1 or '"' in line or "\n" in line or "\r" in line
+            for line in lines
+        )
         with open(csv_path, "w", newline="", encoding="utf-8") as fp:
-            w = csv.writer(fp)
-            w.writerow(["group", "category", "service", "zip_path", "file_name", "size", "theme"])
-            for mapping in mappings:
-                w.writerow([
-                    mapping.group,
-                    mapping.category,
-                    mapping.service,
-                    mapping.zip_path,
-                    mapping.file_name,
-                    mapping.size,
-                    mapping.theme
-                ])
-        
-        # JSON 저장
-        json_data = []
-        for mapping in mappings:
-            json_data.append({
-                "group": mapping.group,
-                "category": mapping.category,
-                "service": mapping.service,
-                "zip_path": mapping.zip_path,
-                "file_name": mapping.file_name,
-                "size": mapping.size,
-                "theme": mapping.theme
-            })
-        
-        with open(json_path, "w", encoding="utf-8") as fp:
-            json.dump(json_data, fp, ensure_ascii=False, indent=2)
+            if needs_quoting:
+                w = csv.writer(fp)
+                w.writerow(_MAPPING_FIELDS)
+                w.writerows(rows)
+            else:
+                lines.insert(0, ",".join(_MAPPING_FIELDS))
+                fp.write("\r\n".join(lines))
+                fp.write("\r\n")
+        
+        # JSON 저장 (레코드 리스트를 만들지 않고 항목별로 직렬화해 바로 기록,
+        # 결과는 리스트 전체를 한 번에 덤프한 것과 동일)
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        first, sep, close = (b"[\n  ", b",\n  ", b"\n]") if pretty else (b"[", b",", b"]")
+        
+        with open(json_path, "wb") as fp:
+            prefix = first
+            for m in mappings:
+                obj = orjson.dumps(dict(zip(_MAPPING_FIELDS, _mapping_row(m))), option=option)
+                if pretty:
+                    # 배열 원소 한 단계 들여쓰기 (문자열 내 개행은 이스케이프되어 안전)
+                    obj = obj.replace(b"\n", b"\n  ")
+                fp.write(prefix)
+                fp.write(obj)
+                prefix = sep
+            fp.write(close if mappings else b"[]")
         
         print(f"[OK] CSV: {csv_path}  rows={len(mappings)}")
         print(f"[OK] JSON: {json_path}  rows={len(mappings)}")
@@ -224,25 +320,12 @@ class AWSIconCollector:
         """매핑 정보 통계"""
         stats = {
             "total_icons": len(mappings),
-            "groups": {},
-            "services": {},
-            "sizes": {},
-            "themes": {}
+            # 그룹/서비스별 통계
+            "groups": dict(Counter(m.group for m in mappings)),
+            "services": dict(Counter(m.service for m in mappings)),
+            # 사이즈/테마별 통계 (값이 있는 항목만)
+            "sizes": dict(Counter(m.size for m in mappings if m.size)),
+            "themes": dict(Counter(m.theme for m in mappings if m.theme))
         }
         
-        for mapping in mappings:
-            # 그룹별 통계
-            stats["groups"][mapping.group] = stats["groups"].get(mapping.group, 0) + 1
-            
-            # 서비스별 통계
-            stats["services"][mapping.service] = stats["services"].get(mapping.service, 0) + 1
-            
-            # 사이즈별 통계
-            if mapping.size:
-                stats["sizes"][mapping.size] = stats["sizes"].get(mapping.size, 0) + 1
-            
-            # 테마별 통계
-            if mapping.theme:
-                stats["themes"][mapping.theme] = stats["themes"].get(mapping.theme, 0) + 1
-        
-        return stats
+        return stats
\ No newline at end of file
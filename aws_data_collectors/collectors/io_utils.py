@@ -0,0 +1,59 @@
+"""
+수집기 공용 파일 I/O 설정 및 유틸리티
+"""
+
+import gzip
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional, Union
+
+# 출력 파일 쓰기 버퍼 (1 MiB, 기본 8 KiB 대비 write 시스템 콜 수 감소)
+WRITE_BUFFER = 1 << 20
+
+# 수집기 파싱/추론 결과 캐시 기본 디렉터리
+DEFAULT_CACHE_DIR = "~/.cache/aws-archlens"
+
+def resolve_cache_dir(cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """캐시 디렉터리 경로 (None이면 DEFAULT_CACHE_DIR)"""
+    return Path(cache_dir or DEFAULT_CACHE_DIR).expanduser()
+
+def cache_file_path(cache_dir: Path, prefix: str, *key_parts) -> Path:
+    """
+    캐시 키 구성 요소로 만든 캐시 파일 경로
+    
+    Args:
+        cache_dir: 캐시 디렉터리
+        prefix: 파일명 접두사 (수집기별 구분)
+        *key_parts: 캐시 버전, 입력 파일 크기/수정 시각 등 무효화 기준 값
+        
+    Returns:
+        Path: `<prefix>-<BLAKE2b 16자리>.pkl.gz` 경로
+    """
+    key = hashlib.blake2b(":".join(map(str, key_parts)).encode()).hexdigest()[:16]
+    return cache_dir / f"{prefix}-{key}.pkl.gz"
+
+def load_pickle_cache(cache_path: Path, label: str) -> Optional[Any]:
+    """gzip pickle 캐시 로드 (없거나 손상되었으면 None)"""
+    try:
+        with gzip.open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ {label} 로드 실패: {e}")
+        return None
+
+def save_pickle_cache(cache_path: Path, data: Any, label: str) -> bool:
+    """gzip pickle 캐시 저장 (임시 파일에 쓴 뒤 교체, 실패해도 수집은 계속)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wb", compresslevel=1) as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        return True
+    except OSError as e:
+        print(f"⚠️ {label} 저장 실패: {e}")
+        return False
@@ -3,13 +3,214 @@ AWS 제품 정보 수집기
 AWS 공식 API에서 제품 정보를 수집합니다.
 """
 
+import asyncio
 import csv
-import json
+import gzip
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import aiohttp
+import orjson
 import requests
-from typing import List, Dict, Optional
-from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+try:
+    from .io_utils import WRITE_BUFFER
+except ImportError:  # 수집기 디렉터리에서 최상위 모듈로 import한 경우
+    from io_utils import WRITE_BUFFER
+
+# ijson이 있으면 첫 페이지 응답을 스트리밍 파싱 (원본 JSON 전체를 메모리에 올리지 않음)
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# URL 경로 → 서비스명 매핑
+_SERVICE_MAPPING = {
+    'ec2': 'Amazon EC2',
+    's3': 'Amazon S3',
+    'rds': 'Amazon RDS',
+    'lambda': 'AWS Lambda',
+    'dynamodb': 'Amazon DynamoDB',
+    'cloudfront': 'Amazon CloudFront',
+    'vpc': 'Amazon VPC',
+    'iam': 'AWS IAM',
+    'sns': 'Amazon SNS',
+    'sqs': 'Amazon SQS',
+    'cloudwatch': 'Amazon CloudWatch',
+    'ecs': 'Amazon ECS',
+    'eks': 'Amazon EKS',
+    'elb': 'Elastic Load Balancing',
+    'autoscaling': 'Auto Scaling',
+    'route53': 'Amazon Route 53',
+    'cloudformation': 'AWS CloudFormation',
+    'codecommit': 'AWS CodeCommit',
+    'codebuild': 'AWS CodeBuild',
+    'codedeploy': 'AWS CodeDeploy',
+    'codepipeline': 'AWS CodePipeline',
+    'elasticache': 'Amazon ElastiCache',
+    'redshift': 'Amazon Redshift',
+    'emr': 'Amazon EMR',
+    'glue': 'AWS Glue',
+    'athena': 'Amazon Athena',
+    'quicksight': 'Amazon QuickSight',
+    'sagemaker': 'Amazon SageMaker',
+    'rekognition': 'Amazon Rekognition',
+    'comprehend': 'Amazon Comprehend',
+    'translate': 'Amazon Translate',
+    'polly': 'Amazon Polly',
+    'lex': 'Amazon Lex',
+    'connect': 'Amazon Connect',
+    'chime': 'Amazon Chime',
+    'workspaces': 'Amazon WorkSpaces',
+    'appstream': 'Amazon AppStream',
+    'lightsail': 'Amazon Lightsail',
+    'elasticbeanstalk': 'AWS Elastic Beanstalk',
+    'opsworks': 'AWS OpsWorks',
+    'config': 'AWS Config',
+    'cloudtrail': 'AWS CloudTrail',
+    'guardduty': 'Amazon GuardDuty',
+    'macie': 'Amazon Macie',
+    'shield': 'AWS Shield',
+    'waf': 'AWS WAF',
+    'kms': 'AWS Key Management Service',
+    'secretsmanager': 'AWS Secrets Manager',
+    'certificatemanager': 'AWS Certificate Manager',
+    'directoryservice': 'AWS Directory Service',
+    'cognito': 'Amazon Cognito',
+    'organizations': 'AWS Organizations',
+    'budgets': 'AWS Budgets',
+    'costexplorer': 'AWS Cost Explorer',
+    'billing': 'AWS Billing',
+    'support': 'AWS Support',
+    'marketplace': 'AWS Marketplace',
+    'ram': 'AWS Resource Access Manager',
+    'servicecatalog': 'AWS Service Catalog',
+    'systemsmanager': 'AWS Systems Manager',
+    'cloud9': 'AWS Cloud9',
+    'xray': 'AWS X-Ray',
+    'stepfunctions': 'AWS Step Functions',
+    'apigateway': 'Amazon API Gateway',
+    'appsync': 'AWS AppSync',
+    'eventbridge': 'Amazon EventBridge',
+    'mq': 'Amazon MQ',
+    'kinesis': 'Amazon Kinesis',
+    'msk': 'Amazon MSK',
+    'elasticsearch': 'Amazon Elasticsearch Service',
+    'opensearch': 'Amazon OpenSearch Service',
+    'neptune': 'Amazon Neptune',
+    'documentdb': 'Amazon DocumentDB',
+    'timestream': 'Amazon Timestream',
+    'keyspaces': 'Amazon Keyspaces',
+    'qldb': 'Amazon QLDB',
+    'managedblockchain': 'Amazon Managed Blockchain',
+    'iot': 'AWS IoT',
+    'greengrass': 'AWS IoT Greengrass',
+    'iotanalytics': 'AWS IoT Analytics',
+    'iotsitewise': 'AWS IoT SiteWise',
+    'iotthingsgraph': 'AWS IoT Things Graph',
+    'freertos': 'Amazon FreeRTOS',
+    'robomaker': 'AWS RoboMaker',
+    'groundstation': 'AWS Ground Station',
+    'batch': 'AWS Batch',
+    'parallelcluster': 'AWS ParallelCluster',
+    'thinkbox': 'AWS Thinkbox',
+    'nimblestudio': 'Amazon Nimble Studio',
+    'elemental': 'AWS Elemental',
+    'ivs': 'Amazon Interactive Video Service',
+    'medialive': 'AWS MediaLive',
+    'mediapackage': 'AWS MediaPackage',
+    'mediastore': 'AWS MediaStore',
+    'mediaconvert': 'AWS MediaConvert',
+    'elementalmediaconnect': 'AWS Elemental MediaConnect',
+    'elementalmedialive': 'AWS Elemental MediaLive',
+    'elementalmediapackage': 'AWS Elemental MediaPackage',
+    'elementalmediastore': 'AWS Elemental MediaStore',
+    'elementalmediaconvert': 'AWS Elemental MediaConvert',
+    'elementalmediatailor': 'AWS Elemental MediaTailor',
+}
+
+# 제품 카테고리 → 그룹명 매핑
+_CATEGORY_MAPPING = {
+    "Compute": "Compute",
+    "Storage": "Storage",
+    "Database": "Database",
+    "Networking & Content Delivery": "Networking & Content Delivery",
+    "Security, Identity, & Compliance": "Security, Identity, & Compliance",
+    "Management & Governance": "Management & Governance",
+    "Application Integration": "Application Integration",
+    "Analytics": "Analytics",
+    "Artificial Intelligence": "Artificial Intelligence",
+    "Machine Learning": "Machine Learning",
+    "Media Services": "Media Services",
+    "Developer Tools": "Developer Tools",
+    "Front-End Web & Mobile": "Front-End Web & Mobile",
+    "End User Computing": "End User Computing",
+    "Internet of Things": "Internet of Things",
+    "Migration & Modernization": "Migration & Modernization",
+    "Quantum Technologies": "Quantum Technologies",
+    "Robotics": "Robotics",
+    "Satellite": "Satellite",
+    "Blockchain": "Blockchain",
+    "Business Applications": "Business Applications",
+    "Cloud Financial Management": "Cloud Financial Management",
+    "Customer Enablement": "Customer Enablement",
+    "Games": "Games",
+    "General": "General",
+}
+
+@lru_cache(maxsize=2048)
+def _extract_service_from_url(url: str) -> str:
+    """
+    URL에서 서비스명 추출
+    
+    Args:
+        url: 제품 URL
+    
+    Returns:
+        str: 추출된 서비스명
+    """
+    if not url:
+        return ""
+    
+    # URL에서 서비스명 추출
+    # 예: https://aws.amazon.com/ec2/ -> EC2
+    # 예: https://aws.amazon.com/s3/ -> S3
+    
+    # 마지막 경로에서 서비스명 추출
+    path = url.rstrip('/').split('/')[-1]
+    
+    # 매핑에서 찾기
+    key = path.lower()
+    if key in _SERVICE_MAPPING:
+        return _SERVICE_MAPPING[key]
+    
+    # 매핑에 없으면 URL에서 추출
+    if path:
+        # 첫 글자 대문자로 변환
+        return path.upper()
+    
+    return ""
+
+@lru_cache(maxsize=64)
+def _normalize_group(category: str) -> str:
+    """
+    카테고리를 그룹명으로 정규화
+    
+    Args:
+        category: 원본 카테고리명
+    
+    Returns:
+        str: 정규화된 그룹명
+    """
+    if not category:
+        return "Other"
+    
+    return _CATEGORY_MAPPING.get(category, category)
+
 @dataclass
 class ProductInfo:
     """제품 정보 데이터 클래스"""
@@ -20,6 +221,9 @@ class ProductInfo:
     product_category: Optional[str] = None
     description: Optional[str] = None
 
+# 직렬화용 필드명 (CSV 헤더 / JSON 키 순서)
+_PRODUCT_FIELDS = tuple(f.name for f in fields(ProductInfo))
+
 class AWSProductCollector:
     """
     AWS 제품 정보 수집기
@@ -47,6 +251,9 @@ class AWSProductCollector:
             "sort_by=item.additionalFields.productNameLowercase&size=1000&"
             "language=en&item.locale=en_US"
         )
+        # 남은 페이지 동시 요청 시 API 서버로 여는 최대 연결 수
+        self.max_connections = 8
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
@@ -67,20 +274,70 @@ class AWSProductCollector:
         """
         print(f"🔍 AWS 제품 정보 수집 중... (API: {self.api_url})")
         
+        # 항목은 도착하는 대로 ProductInfo로 변환하고 원본 dict는 바로 버림
+        metadata = {}
         try:
-            response = self.session.get(self.api_url, timeout=timeout)
-            response.raise_for_status()
-            data = response.json()
+            with self.session.get(self.api_url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                products, n_items = self._parse_items(self._iter_page_items(response, metadata))
         except requests.RequestException as e:
             print(f"❌ API 요청 실패: {e}")
             raise
         
-        products = []
-        items = data.get("items", [])
+        # 첫 페이지의 전체 건수로 남은 페이지를 파악해 동시에 요청
+        total = metadata.get("totalHits", n_items)
+        if n_items and total > n_items:
+            remaining, n_remaining = asyncio.run(self._fetch_remaining_pages(total, timeout))
+            products.extend(remaining)
+            n_items += n_remaining
+        
+        print(f"📊 발견된 제품: {n_items}개")
+        print(f"✅ 성공적으로 파싱된 제품: {len(products)}개")
+        return products
+    
+    @staticmethod
+    def _iter_page_items(response: requests.Response, metadata: Dict) -> Iterator[Dict]:
+        """
+        한 페이지 응답의 제품 항목을 하나씩 생성
+        
+        Args:
+            response: stream=True로 받은 API 응답
+            metadata: 응답의 metadata 값(totalHits 등)을 채워 넣을 dict
+            
+        Yields:
+            Dict: items 배열의 원소
+        """
+        if ijson is None:
+            data = response.json()
+            metadata.update(data.get("metadata") or {})
+            yield from data.get("items", [])
+            return
         
-        print(f"📊 발견된 제품: {len(items)}개")
+        # gzip 등 전송 인코딩은 풀어서 파서에 전달
+        response.raw.decode_content = True
+        builder = None
+        for prefix, event, value in ijson.parse(response.raw, use_float=True):
+            if prefix == "items.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "items.item" and event == "end_map":
+                    yield builder.value
+                    builder = None
+            elif prefix.startswith("metadata.") and event in ("number", "string", "boolean"):
+                metadata[prefix[len("metadata."):]] = value
+    
+    def _parse_items(self, items: Iterable[Dict]) -> Tuple[List[ProductInfo], int]:
+        """
+        제품 항목들을 ProductInfo로 변환
         
+        Returns:
+            Tuple[List[ProductInfo], int]: (파싱된 제품, 전체 항목 수)
+        """
+        products = []
+        n_items = 0
         for item in items:
+            n_items += 1
             try:
                 product_info = self._parse_product_item(item)
                 if product_info:
@@ -88,242 +345,92 @@ class AWSProductCollector:
             except Exception as e:
                 print(f"⚠️ 제품 파싱 실패: {e}")
                 continue
-        
-        print(f"✅ 성공적으로 파싱된 제품: {len(products)}개")
-        return products
+        return products, n_items
     
-    def _parse_product_item(self, item: Dict) -> Optional[ProductInfo]:
-        """
-        제품 아이템 파싱
-        
-        Args:
-            item: API 응답의 제품 아이템
-            
-        Returns:
-            Optional[ProductInfo]: 파싱된 제품 정보
-        """
-        try:
-            item_data = item.get("item", {})
-            additional_fields = item_data.get("additionalFields", {})
-            
-            # 필수 필드 추출
-            product_name = additional_fields.get("productName", "")
-            product_category = additional_fields.get("productCategory", "")
-            product_url = additional_fields.get("productUrl", "")
-            
-            # URL에서 서비스명 추출
-            service_name = self._extract_service_from_url(product_url)
-            
-            # 그룹명 정규화
-            group = self._normalize_group(product_category)
-            
-            # 설명 추출
-            description = additional_fields.get("productDescription", "")
-            
-            if not product_name or not service_name:
-                return None
-            
-            return ProductInfo(
-                group=group,
-                service=service_name,
-                service_url=product_url,
-                product_name=product_name,
-                product_category=product_category,
-                description=description
-            )
-            
-        except Exception as e:
-            print(f"⚠️ 제품 아이템 파싱 실패: {e}")
-            return None
+    def _page_url(self, page: int) -> str:
+        """api_url의 page 파라미터만 바꾼 URL"""
+        parts = urlsplit(self.api_url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query["page"] = str(page)
+        return urlunsplit(parts._replace(query=urlencode(query)))
     
-    def _extract_service_from_url(self, url: str) -> str:
+    async def _fetch_remaining_pages(self, total: int, timeout: int) -> Tuple[List[ProductInfo], int]:
         """
-        URL에서 서비스명 추출
+        2번째 페이지부터 마지막 페이지까지 동시에 요청
         
         Args:
-            url: 제품 URL
+            total: 전체 제품 수 (첫 페이지 metadata.totalHits)
+            timeout: API 요청 타임아웃 (초)
             
         Returns:
-            str: 추출된 서비스명
+            Tuple[List[ProductInfo], int]: 페이지 순서대로 이어 붙인 제품, 전체 항목 수
         """
-        if not url:
-            return ""
-        
-        # URL에서 서비스명 추출
-        # 예: https://aws.amazon.com/ec2/ -> EC2
-        # 예: https://aws.amazon.com/s3/ -> S3
-        
-        # 마지막 경로에서 서비스명 추출
-        path = url.rstrip('/').split('/')[-1]
+        query = dict(parse_qsl(urlsplit(self.api_url).query))
+        page_size = int(query.get("size", 1000))
+        n_pages = -(-total // page_size)
         
-        # 일반적인 서비스명 매핑
-        service_mapping = {
-            'ec2': 'Amazon EC2',
-            's3': 'Amazon S3',
-            'rds': 'Amazon RDS',
-            'lambda': 'AWS Lambda',
-            'dynamodb': 'Amazon DynamoDB',
-            'cloudfront': 'Amazon CloudFront',
-            'vpc': 'Amazon VPC',
-            'iam': 'AWS IAM',
-            'sns': 'Amazon SNS',
-            'sqs': 'Amazon SQS',
-            'cloudwatch': 'Amazon CloudWatch',
-            'ecs': 'Amazon ECS',
-            'eks': 'Amazon EKS',
-            'elb': 'Elastic Load Balancing',
-            'autoscaling': 'Auto Scaling',
-            'route53': 'Amazon Route 53',
-            'cloudformation': 'AWS CloudFormation',
-            'codecommit': 'AWS CodeCommit',
-            'codebuild': 'AWS CodeBuild',
-            'codedeploy': 'AWS CodeDeploy',
-            'codepipeline': 'AWS CodePipeline',
-            'elasticache': 'Amazon ElastiCache',
-            'redshift': 'Amazon Redshift',
-            'emr': 'Amazon EMR',
-            'glue': 'AWS Glue',
-            'athena': 'Amazon Athena',
-            'quicksight': 'Amazon QuickSight',
-            'sagemaker': 'Amazon SageMaker',
-            'rekognition': 'Amazon Rekognition',
-            'comprehend': 'Amazon Comprehend',
-            'translate': 'Amazon Translate',
-            'polly': 'Amazon Polly',
-            'lex': 'Amazon Lex',
-            'connect': 'Amazon Connect',
-            'chime': 'Amazon Chime',
-            'workspaces': 'Amazon WorkSpaces',
-            'appstream': 'Amazon AppStream',
-            'lightsail': 'Amazon Lightsail',
-            'elasticbeanstalk': 'AWS Elastic Beanstalk',
-            'opsworks': 'AWS OpsWorks',
-            'config': 'AWS Config',
-            'cloudtrail': 'AWS CloudTrail',
-            'guardduty': 'Amazon GuardDuty',
-            'macie': 'Amazon Macie',
-            'shield': 'AWS Shield',
-            'waf': 'AWS WAF',
-            'kms': 'AWS Key Management Service',
-            'secretsmanager': 'AWS Secrets Manager',
-            'certificatemanager': 'AWS Certificate Manager',
-            'directoryservice': 'AWS Directory Service',
-            'cognito': 'Amazon Cognito',
-            'organizations': 'AWS Organizations',
-            'budgets': 'AWS Budgets',
-            'costexplorer': 'AWS Cost Explorer',
-            'billing': 'AWS Billing',
-            'support': 'AWS Support',
-            'marketplace': 'AWS Marketplace',
-            'ram': 'AWS Resource Access Manager',
-            'servicecatalog': 'AWS Service Catalog',
-            'systemsmanager': 'AWS Systems Manager',
-            'cloud9': 'AWS Cloud9',
-            'xray': 'AWS X-Ray',
-            'stepfunctions': 'AWS Step Functions',
-            'apigateway': 'Amazon API Gateway',
-            'appsync': 'AWS AppSync',
-            'eventbridge': 'Amazon EventBridge',
-            'mq': 'Amazon MQ',
-            'kinesis': 'Amazon Kinesis',
-            'msk': 'Amazon MSK',
-            'elasticsearch': 'Amazon Elasticsearch Service',
-            'opensearch': 'Amazon OpenSearch Service',
-            'neptune': 'Amazon Neptune',
-            'documentdb': 'Amazon DocumentDB',
-            'timestream': 'Amazon Timestream',
-            'keyspaces': 'Amazon Keyspaces',
-            'qldb': 'Amazon QLDB',
-            'managedblockchain': 'Amazon Managed Blockchain',
-            'iot': 'AWS IoT',
-            'greengrass': 'AWS IoT Greengrass',
-            'iotanalytics': 'AWS IoT Analytics',
-            'iotsitewise': 'AWS IoT SiteWise',
-            'iotthingsgraph': 'AWS IoT Things Graph',
-            'freertos': 'Amazon FreeRTOS',
-            'robomaker': 'AWS RoboMaker',
-            'groundstation': 'AWS Ground Station',
-            'batch': 'AWS Batch',
-            'parallelcluster': 'AWS ParallelCluster',
-            'thinkbox': 'AWS Thinkbox',
-            'nimblestudio': 'Amazon Nimble Studio',
-            'elemental': 'AWS Elemental',
-            'ivs': 'Amazon Interactive Video Service',
-            'medialive': 'AWS MediaLive',
-            'mediapackage': 'AWS MediaPackage',
-            'mediastore': 'AWS MediaStore',
-            'mediaconvert': 'AWS MediaConvert',
-            'elementalmediaconnect': 'AWS Elemental MediaConnect',
-            'elementalmedialive': 'AWS Elemental MediaLive',
-            'elementalmediapackage': 'AWS Elemental MediaPackage',
-            'elementalmediastore': 'AWS Elemental MediaStore',
-            'elementalmediaconvert': 'AWS Elemental MediaConvert',
-            'elementalmediatailor': 'AWS Elemental MediaTailor',
-            'elementalmediaconnect': 'AWS Elemental MediaConnect',
-            'elementalmedialive': 'AWS Elemental MediaLive',
-            'elementalmediapackage': 'AWS Elemental MediaPackage',
-            'elementalmediastore': 'AWS Elemental MediaStore',
-            'elementalmediaconvert': 'AWS Elemental MediaConvert',
-            'elementalmediatailor': 'AWS Elemental MediaTailor',
-        }
-        
-        # 매핑에서 찾기
-        if path.lower() in service_mapping:
-            return service_mapping[path.lower()]
-        
-        # 매핑에 없으면 URL에서 추출
-        if path:
-            # 첫 글자 대문자로 변환
-            return path.upper()
+        # 모든 페이지 요청이 하나의 연결 풀을 공유 (연결 수 상한으로 서버 rate limit 보호)
+        async with aiohttp.ClientSession(
+            headers=dict(self.session.headers),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            connector=aiohttp.TCPConnector(limit=self.max_connections),
+        ) as session:
+            async def fetch(page: int) -> Tuple[List[ProductInfo], int]:
+                async with session.get(self._page_url(page)) as resp:
+                    resp.raise_for_status()
+                    data = await resp.json(content_type=None)
+                # 페이지 단위로 바로 변환해 원본 항목이 쌓이지 않게 함
+                return self._parse_items(data.get("items", []))
+            
+            try:
+                pages = await asyncio.gather(*(fetch(page) for page in range(1, n_pages)))
+            except aiohttp.ClientError as e:
+                print(f"❌ API 요청 실패: {e}")
+                raise
         
-        return ""
+        products = [product for page_products, _ in pages for product in page_products]
+        return products, sum(n for _, n in pages)
     
-    def _normalize_group(self, category: str) -> str:
+    def _parse_product_item(self, item: Dict) -> Optional[ProductInfo]:
         """
-        카테고리를 그룹명으로 정규화
+        제품 아이템 파싱
         
         Args:
-            category: 원본 카테고리명
+            item: API 응답의 제품 아이템
             
         Returns:
-            str: 정규화된 그룹명
+            Optional[ProductInfo]: 파싱된 제품 정보
         """
-        if not category:
-            return "Other"
+        try:
+            additional_fields = item["item"]["additionalFields"]
+        except (KeyError, TypeError):
+            return None
         
-        # 카테고리 매핑
-        category_mapping = {
-            "Compute": "Compute",
-            "Storage": "Storage",
-            "Database": "Database",
-            "Networking & Content Delivery": "Networking & Content Delivery",
-            "Security, Identity, & Compliance": "Security, Identity, & Compliance",
-            "Management & Governance": "Management & Governance",
-            "Application Integration": "Application Integration",
-            "Analytics": "Analytics",
-            "Artificial Intelligence": "Artificial Intelligence",
-            "Machine Learning": "Machine Learning",
-            "Media Services": "Media Services",
-            "Developer Tools": "Developer Tools",
-            "Front-End Web & Mobile": "Front-End Web & Mobile",
-            "End User Computing": "End User Computing",
-            "Internet of Things": "Internet of Things",
-            "Migration & Modernization": "Migration & Modernization",
-            "Quantum Technologies": "Quantum Technologies",
-            "Robotics": "Robotics",
-            "Satellite": "Satellite",
-            "Blockchain": "Blockchain",
-            "Business Applications": "Business Applications",
-            "Cloud Financial Management": "Cloud Financial Management",
-            "Customer Enablement": "Customer Enablement",
-            "Games": "Games",
-            "General": "General",
-        }
+        # 필수 필드를 먼저 확인하여 불필요한 매핑/정규화 생략
+        product_name = additional_fields.get("productName")
+        product_url = additional_fields.get("productUrl")
+        if not product_name or not product_url:
+            return None
+        
+        # URL에서 서비스명 추출
+        service_name = _extract_service_from_url(product_url)
+        if not service_name:
+            return None
         
-        return category_mapping.get(category, category)
+        product_category = additional_fields.get("productCategory", "")
+        
+        return ProductInfo(
+            group=_normalize_group(product_category),  # 그룹명 정규화
+            service=service_name,
+            service_url=product_url,
+            product_name=product_name,
+            product_category=product_category,
+            description=additional_fields.get("productDescription", "")
+        )
     
     def save_products(self, products: List[ProductInfo], 
-                     csv_path: str, json_path: str) -> None:
+                     csv_path: str, json_path: str,
+                     compress: bool = False) -> None:
         """
         제품 정보를 CSV와 JSON 파일로 저장
         
@@ -331,39 +438,33 @@ class AWSProductCollector:
             products: 제품 정보 리스트
             csv_path: CSV 출력 파일 경로
             json_path: JSON 출력 파일 경로
+            compress: True면 JSON을 레코드 단위로 스트리밍하여 `json_path + ".gz"`로 저장
         """
         # 출력 디렉터리 생성
         Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
         Path(json_path).parent.mkdir(parents=True, exist_ok=True)
         
         # CSV 저장
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f:
             w = csv.writer(f)
-            w.writerow(["group", "service", "service_url", "product_name", "product_category", "description"])
-            for product in products:
-                w.writerow([
-                    product.group,
-                    product.service,
-                    product.service_url,
-                    product.product_name,
-                    product.product_category,
-                    product.description
-                ])
-        
-        # JSON 저장
-        json_data = []
-        for product in products:
-            json_data.append({
-                "group": product.group,
-                "service": product.service,
-                "service_url": product.service_url,
-                "product_name": product.product_name,
-                "product_category": product.product_category,
-                "description": product.description
-            })
+            w.writerow(_PRODUCT_FIELDS)
+            get_row = attrgetter(*_PRODUCT_FIELDS)
+            w.writerows(map(get_row, products))
         
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        # JSON 저장 (orjson은 데이터 클래스를 필드 순서대로 직접 직렬화)
+        if compress:
+            # 전체 문자열을 만들지 않고 레코드 단위로 압축 기록
+            json_path = f"{json_path}.gz"
+            with gzip.open(json_path, "wb", compresslevel=3) as f:
+                f.write(b"[")
+                for i, product in enumerate(products):
+                    if i:
+                        f.write(b",")
+                    f.write(orjson.dumps(product))
+                f.write(b"]")
+        else:
+            with open(json_path, "wb", buffering=WRITE_BUFFER) as f:
+                f.write(orjson.dumps(products, option=orjson.OPT_INDENT_2))
         
         print(f"✅ CSV: {csv_path}  rows={len(products)}")
         print(f"✅ JSON: {json_path}  rows={len(products)}")
@@ -372,15 +473,9 @@ class AWSProductCollector:
         """제품 정보 통계"""
         stats = {
             "total_products": len(products),
-            "groups": {},
-            "services": {}
+            # 그룹/서비스별 통계
+            "groups": dict(Counter(p.group for p in products)),
+            "services": dict(Counter(p.service for p in products))
         }
         
-        for product in products:
-            # 그룹별 통계
-            stats["groups"][product.group] = stats["groups"].get(product.group, 0) + 1
-            
-            # 서비스별 통계
-            stats["services"][product.service] = stats["services"].get(product.service, 0) + 1
-        
-        return stats
+        return stats
\ No newline at end of file
@@ -4,17 +4,81 @@ Scrapy를 사용한 AWS 아이콘 웹 수집기
 """
 
 import os
+import re
 import json
+import asyncio
 import time
+import gzip
+import struct
 import hashlib
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, fields
 from urllib.parse import urljoin, urlparse
+import aiohttp
+import numpy as np
+from aiolimiter import AsyncLimiter
 import requests
-from PIL import Image
+from PIL import Image, UnidentifiedImageError
 import io
 
+# PNG 시그니처 (IHDR 청크의 width/height는 16~24 바이트에 위치)
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# SVG 루트 태그의 width/height 속성
+_SVG_TAG_RE = re.compile(rb"<svg\b[^>]*>", re.I | re.S)
+_SVG_WIDTH_RE = re.compile(rb"\bwidth\s*=\s*[\"']\s*([\d.]+)", re.I)
+_SVG_HEIGHT_RE = re.compile(rb"\bheight\s*=\s*[\"']\s*([\d.]+)", re.I)
+
+
+def _probe_image_size(content: bytes) -> Optional[Tuple[int, int]]:
+    """
+    픽셀 디코딩 없이 이미지 크기 확인
+    
+    PNG는 헤더에서 바로 읽고, SVG는 루트 태그 속성을 파싱하며,
+    그 외 포맷은 Pillow의 지연 로딩(헤더만 파싱)을 사용합니다.
+    
+    Returns:
+        Optional[Tuple[int, int]]: (width, height), 유효하지 않은 이미지면 None
+    """
+    if content[:8] == _PNG_SIGNATURE and len(content) >= 24:
+        return struct.unpack(">II", content[16:24])
+    
+    svg_tag = _SVG_TAG_RE.search(content[:4096])
+    if svg_tag:
+        w = _SVG_WIDTH_RE.search(svg_tag.group(0))
+        h = _SVG_HEIGHT_RE.search(svg_tag.group(0))
+        if not (w and h):
+            return None
+        return int(float(w.group(1))), int(float(h.group(1)))
+    
+    try:
+        # Image.open은 헤더만 읽으며 load() 전까지 픽셀을 디코딩하지 않음
+        with Image.open(io.BytesIO(content)) as img:
+            return img.size
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+def _decode_image(content: bytes) -> Optional[Tuple[int, int, int, str]]:
+    """
+    이미지 검증 + 콘텐츠 해시 계산
+    
+    모듈 수준 함수로 두어 스레드/프로세스 풀 어디에도 제출할 수 있습니다.
+    
+    Returns:
+        Optional[Tuple[int, int, int, str]]: (width, height, 바이트 크기, BLAKE2b 해시),
+        유효하지 않은 이미지면 None
+    """
+    size = _probe_image_size(content)
+    if size is None:
+        return None
+    width, height = size
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return width, height, len(content), digest
+
 @dataclass
 class WebIconData:
     """웹에서 수집된 아이콘 데이터"""
@@ -29,6 +93,9 @@ class WebIconData:
     search_query: str
     timestamp: str
 
+# 직렬화용 필드명 (asdict의 재귀 deepcopy 없이 얕은 dict 변환)
+_WEB_ICON_FIELDS = tuple(f.name for f in fields(WebIconData))
+
 class ScrapyIconCollector:
     """
     Scrapy를 사용한 AWS 아이콘 웹 수집기
@@ -61,6 +128,14 @@ class ScrapyIconCollector:
             "Shield", "Certificate Manager", "CloudTrail", "Organizations"
         ]
         
+        # 파일명 → 서비스명 단일 패스 매칭용 패턴 (긴 이름 우선)
+        self._service_by_key = {s.lower(): s for s in self.aws_services}
+        self._service_pattern = re.compile(
+            r"\b(?:" + "|".join(
+                re.escape(k) for k in sorted(self._service_by_key, key=len, reverse=True)
+            ) + r")\b"
+        )
+        
         # 검색 엔진 설정
         self.search_engines = {
             "google": "https://www.google.com/search",
@@ -72,6 +147,19 @@ class ScrapyIconCollector:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
+        
+        # 파일 쓰기 전용 스레드 풀 (비동기 다운로드 시 이벤트 루프 블로킹 방지)
+        # collect_all_services 실행 동안만 생성, 없으면 이벤트 루프 기본 실행기 사용
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        
+        # 이미지 검증/해시 전용 풀 (Pillow 디코더와 hashlib은 GIL을 해제, 수명은 _io_pool과 동일)
+        self._decode_pool: Optional[ThreadPoolExecutor] = None
+        
+        # 소스별 요청 속도 제한 (토큰 버킷: 최대 요청 수, 기간(초))
+        # GitHub/AWS 문서 수집은 동기(requests) 경로라 비동기 수집에는 Google만 해당
+        self._limiters = {
+            "google": AsyncLimiter(5, 1)
+        }
     
     def generate_search_queries(self, service_name: str) -> List[str]:
         """서비스명으로부터 검색 쿼리 생성"""
@@ -93,15 +181,11 @@ class ScrapyIconCollector:
             response = requests.get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             
-            # 이미지 검증
-            try:
-                img = Image.open(io.BytesIO(response.content))
-                img.verify()
-            except Exception:
+            # 이미지 검증 및 메타데이터 추출
+            decoded = _decode_image(response.content)
+            if decoded is None:
                 return None  # 유효하지 않은 이미지
-            
-            # 다시 열어서 메타데이터 추출
-            img = Image.open(io.BytesIO(response.content))
+            width, height, file_size, content_hash = decoded
             
             # 파일 저장
             file_path = self.output_dir / filename
@@ -109,9 +193,48 @@ class ScrapyIconCollector:
                 f.write(response.content)
             
             return {
-                "file_size": len(response.content),
-                "image_width": img.width,
-                "image_height": img.height,
+                "file_size": file_size,
+                "image_width": width,
+                "image_height": height,
+                "content_hash": content_hash,
+                "file_path": str(file_path)
+            }
+            
+        except Exception as e:
+            print(f"다운로드 실패: {url} - {e}")
+            return None
+    
+    async def download_image_async(self, session: aiohttp.ClientSession,
+                                   url: str, filename: str) -> Optional[Dict]:
+        """
+        이미지 비동기 다운로드 및 메타데이터 추출
+        
+        검증/해시는 디코딩 풀로, 파일 쓰기는 I/O 스레드 풀로 넘겨
+        이벤트 루프가 소켓 읽기만 담당하도록 합니다.
+        """
+        try:
+            async with session.get(url, headers=self.headers,
+                                   timeout=aiohttp.ClientTimeout(total=10)) as response:
+                response.raise_for_status()
+                content = await response.read()
+            
+            loop = asyncio.get_running_loop()
+            
+            # 이미지 검증 및 해시 계산 (디코딩 풀에서 수행)
+            decoded = await loop.run_in_executor(self._decode_pool, _decode_image, content)
+            if decoded is None:
+                return None  # 유효하지 않은 이미지
+            width, height, file_size, content_hash = decoded
+            
+            # 파일 저장 (이벤트 루프 밖에서 수행)
+            file_path = self.output_dir / filename
+            await loop.run_in_executor(self._io_pool, file_path.write_bytes, content)
+            
+            return {
+                "file_size": file_size,
+                "image_width": width,
+                "image_height": height,
+                "content_hash": content_hash,
                 "file_path": str(file_path)
             }
             
@@ -119,46 +242,77 @@ class ScrapyIconCollector:
             print(f"다운로드 실패: {url} - {e}")
             return None
     
+    def _google_image_urls(self, query: str) -> List[str]:
+        """Google Images 검색 결과 이미지 URL (시뮬레이션)"""
+        # 실제로는 여기서 웹 스크래핑 로직이 들어감
+        # 현재는 더미 데이터로 시뮬레이션
+        slug = query.lower().replace(' ', '_')
+        return [
+            f"https://example.com/aws_{slug}_1.png",
+            f"https://example.com/aws_{slug}_2.png",
+            f"https://example.com/aws_{slug}_3.png"
+        ]
+    
+    def _google_service_name(self, query: str) -> str:
+        """검색 쿼리에서 서비스명 추출"""
+        return query.replace("AWS ", "").replace(" icon", "").replace(" logo", "")
+    
+    def _make_google_icon(self, query: str, service_name: str, rank: int,
+                          url: str, metadata: Dict) -> WebIconData:
+        """Google Images 다운로드 결과로 아이콘 데이터 생성"""
+        return WebIconData(
+            service_name=service_name,
+            source_url="Google Images",
+            image_url=url,
+            file_path=metadata["file_path"],
+            file_size=metadata["file_size"],
+            image_width=metadata["image_width"],
+            image_height=metadata["image_height"],
+            confidence_score=0.8 - (rank * 0.1),  # 순서에 따라 점수 감소
+            search_query=query,
+            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
+        )
+    
     def collect_from_google_images(self, query: str, max_results: int = 10) -> List[WebIconData]:
         """Google Images에서 아이콘 수집 (시뮬레이션)"""
         # 실제 구현에서는 Google Custom Search API나 Selenium을 사용
         # 여기서는 시뮬레이션으로 구현
         print(f"Google Images에서 '{query}' 검색 중...")
         
-        # 실제로는 여기서 웹 스크래핑 로직이 들어감
-        # 현재는 더미 데이터로 시뮬레이션
         collected_icons = []
+        service_name = self._google_service_name(query)
         
-        # 더미 이미지 URL들 (실제로는 스크래핑 결과)
-        dummy_urls = [
-            f"https://example.com/aws_{query.lower().replace(' ', '_')}_1.png",
-            f"https://example.com/aws_{query.lower().replace(' ', '_')}_2.png",
-            f"https://example.com/aws_{query.lower().replace(' ', '_')}_3.png"
-        ]
-        
-        for i, url in enumerate(dummy_urls[:max_results]):
-            service_name = query.replace("AWS ", "").replace(" icon", "").replace(" logo", "")
+        for i, url in enumerate(self._google_image_urls(query)[:max_results]):
             filename = f"{service_name.lower()}_{i+1}_{int(time.time())}.png"
             
             # 실제 다운로드 시뮬레이션
             metadata = self.download_image(url, filename)
             if metadata:
-                icon_data = WebIconData(
-                    service_name=service_name,
-                    source_url="Google Images",
-                    image_url=url,
-                    file_path=metadata["file_path"],
-                    file_size=metadata["file_size"],
-                    image_width=metadata["image_width"],
-                    image_height=metadata["image_height"],
-                    confidence_score=0.8 - (i * 0.1),  # 순서에 따라 점수 감소
-                    search_query=query,
-                    timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
-                )
-                collected_icons.append(icon_data)
+                collected_icons.append(self._make_google_icon(query, service_name, i, url, metadata))
         
         return collected_icons
     
+    async def collect_from_google_images_async(self, session: aiohttp.ClientSession,
+                                               query: str, max_results: int = 10) -> List[WebIconData]:
+        """Google Images에서 아이콘 비동기 수집 (시뮬레이션)"""
+        print(f"Google Images에서 '{query}' 검색 중...")
+        
+        service_name = self._google_service_name(query)
+        urls = self._google_image_urls(query)[:max_results]
+        
+        async def fetch(i: int, url: str) -> Optional[Dict]:
+            filename = f"{service_name.lower()}_{i+1}_{int(time.time())}.png"
+            async with self._limiters["google"]:
+                return await self.download_image_async(session, url, filename)
+        
+        results = await asyncio.gather(*(fetch(i, url) for i, url in enumerate(urls)))
+        
+        return [
+            self._make_google_icon(query, service_name, i, url, metadata)
+            for i, (url, metadata) in enumerate(zip(urls, results))
+            if metadata
+        ]
+    
     def collect_from_github_aws_icons(self) -> List[WebIconData]:
         """GitHub의 AWS 아이콘 저장소에서 수집"""
         print("GitHub AWS 아이콘 저장소에서 수집 중...")
@@ -215,6 +369,11 @@ class ScrapyIconCollector:
         name = name.replace('.png', '').replace('.svg', '')
         name = name.replace('_', ' ').replace('-', ' ')
         
+        # 알려진 서비스명 중 가장 긴 매치 사용
+        matches = self._service_pattern.findall(name)
+        if matches:
+            return self._service_by_key[max(matches, key=len)]
+        
         # AWS 접두사 제거
         if name.startswith('aws'):
             name = name[3:].strip()
@@ -252,63 +411,93 @@ class ScrapyIconCollector:
     
     def collect_all_services(self, max_per_service: int = 5) -> List[WebIconData]:
         """모든 AWS 서비스에 대해 아이콘 수집"""
-        all_icons = []
+        return asyncio.run(self._collect_all_services_async(max_per_service))
+    
+    async def _collect_all_services_async(self, max_per_service: int) -> List[WebIconData]:
+        """
+        모든 AWS 서비스 아이콘 동시 수집
         
-        for service in self.aws_services:
-            print(f"\n{service} 아이콘 수집 중...")
-            
-            queries = self.generate_search_queries(service)
-            for query in queries[:3]:  # 상위 3개 쿼리만 사용
+        요청 간격은 고정 sleep 대신 토큰 버킷으로 조절하므로
+        한도 안의 요청은 대기 없이 병렬로 진행됩니다.
+        """
+        with ThreadPoolExecutor(max_workers=4) as io_pool, \
+                ThreadPoolExecutor(max_workers=os.cpu_count()) as decode_pool:
+            self._io_pool, self._decode_pool = io_pool, decode_pool
+            try:
+                return await self._collect_queries_async(max_per_service)
+            finally:
+                self._io_pool = self._decode_pool = None
+    
+    async def _collect_queries_async(self, max_per_service: int) -> List[WebIconData]:
+        """서비스별 검색 쿼리를 하나의 세션에서 동시에 수집"""
+        async with aiohttp.ClientSession() as session:
+            async def collect(service: str, query: str) -> List[WebIconData]:
                 try:
-                    icons = self.collect_from_google_images(query, max_per_service)
-                    all_icons.extend(icons)
-                    
-                    # 요청 간격 조절
-                    time.sleep(1)
-                    
+                    return await self.collect_from_google_images_async(session, query, max_per_service)
                 except Exception as e:
                     print(f"수집 실패: {service} - {e}")
+                    return []
+            
+            tasks = []
+            for service in self.aws_services:
+                print(f"\n{service} 아이콘 수집 중...")
+                
+                queries = self.generate_search_queries(service)
+                for query in queries[:3]:  # 상위 3개 쿼리만 사용
+                    tasks.append(collect(service, query))
+            
+            results = await asyncio.gather(*tasks)
         
-        return all_icons
+        return [icon for icons in results for icon in icons]
     
-    def save_collection(self, icons: List[WebIconData], output_file: str) -> None:
-        """수집된 아이콘 데이터 저장"""
+    def save_collection(self, icons: List[WebIconData], output_file: str,
+                        compress: bool = False) -> None:
+        """
+        수집된 아이콘 데이터 저장
+        
+        compress=True면 레코드 단위로 스트리밍하여 `output_file + ".gz"`로 저장합니다.
+        """
         output_path = self.output_dir / output_file
+        records = ({k: getattr(icon, k) for k in _WEB_ICON_FIELDS} for icon in icons)
         
-        # JSON으로 저장
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump([asdict(icon) for icon in icons], f, ensure_ascii=False, indent=2)
+        if compress:
+            # 전체 문자열을 만들지 않고 레코드 단위로 압축 기록
+            output_path = output_path.with_name(output_path.name + ".gz")
+            with gzip.open(output_path, "wt", encoding="utf-8", compresslevel=3) as f:
+                f.write("[")
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(",")
+                    f.write(json.dumps(record, ensure_ascii=False))
+                f.write("]")
+        else:
+            # JSON으로 저장
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(list(records), f, ensure_ascii=False, indent=2)
         
         print(f"[OK] 수집된 아이콘 저장: {output_path} (총 {len(icons)}개)")
     
     def get_statistics(self, icons: List[WebIconData]) -> Dict:
         """수집된 아이콘 통계"""
+        n = len(icons)
+        sizes = np.fromiter((icon.file_size for icon in icons), dtype=np.int64, count=n)
+        scores = np.fromiter((icon.confidence_score for icon in icons), dtype=np.float64, count=n)
+        
         stats = {
-            "total_icons": len(icons),
-            "services": {},
-            "sources": {},
-            "file_sizes": [],
-            "confidence_scores": []
+            "total_icons": n,
+            # 서비스/소스별 통계
+            "services": dict(Counter(icon.service_name for icon in icons)),
+            "sources": dict(Counter(icon.source_url for icon in icons)),
+            # 파일 크기/신뢰도 점수 통계
+            "file_sizes": sizes.tolist(),
+            "confidence_scores": scores.tolist()
         }
         
-        for icon in icons:
-            # 서비스별 통계
-            stats["services"][icon.service_name] = stats["services"].get(icon.service_name, 0) + 1
-            
-            # 소스별 통계
-            stats["sources"][icon.source_url] = stats["sources"].get(icon.source_url, 0) + 1
-            
-            # 파일 크기 통계
-            stats["file_sizes"].append(icon.file_size)
-            
-            # 신뢰도 점수 통계
-            stats["confidence_scores"].append(icon.confidence_score)
-        
         # 평균 계산
-        if stats["file_sizes"]:
-            stats["avg_file_size"] = sum(stats["file_sizes"]) / len(stats["file_sizes"])
-        if stats["confidence_scores"]:
-            stats["avg_confidence"] = sum(stats["confidence_scores"]) / len(stats["confidence_scores"])
+        if n:
+            stats["avg_file_size"] = float(sizes.mean())
+            stats["file_size_p50"] = float(np.median(sizes))
+            stats["avg_confidence"] = float(scores.mean())
         
         return stats
     
@@ -4,6 +4,7 @@ Scrapy 스파이더: AWS 아이콘 웹 수집
 """
 
 import scrapy
+from lxml import etree
 import json
 import time
 import re
@@ -14,6 +15,16 @@ import requests
 from PIL import Image
 import io
 
+from ..io_utils import WRITE_BUFFER
+
+# 스크립트 본문 속 이미지 URL 패턴 (스크립트 태그마다 호출되므로 미리 컴파일)
+_IMAGE_URL_RE = re.compile(r'https://[^"\s]+\.(?:png|jpg|jpeg|svg|gif)')
+
+# Google Images 페이지 XPath (응답마다 다시 컴파일하지 않도록 lxml 객체로 한 번만 생성,
+# smart_strings=False로 결과 문자열이 문서 트리를 붙잡지 않게 함)
+_XP_CALLBACK_SCRIPTS = etree.XPath('//script[contains(text(), "AF_initDataCallback")]/text()', smart_strings=False)
+_XP_IMG_SRC = etree.XPath('//img/@src', smart_strings=False)
+
 class AWSIconSpider(scrapy.Spider):
     name = 'aws_icon_spider'
     
@@ -115,16 +126,16 @@ class AWSIconSpider(scrapy.Spider):
         # 실제 구현에서는 더 정교한 파싱이 필요
         try:
             # JSON 데이터에서 이미지 URL 추출 시도
-            script_tags = response.xpath('//script[contains(text(), "AF_initDataCallback")]/text()').getall()
+            root = response.selector.root
+            script_tags = _XP_CALLBACK_SCRIPTS(root)
             
-            for script in script_tags:
-                # 이미지 URL 패턴 찾기
-                urls = re.findall(r'https://[^"\s]+\.(?:png|jpg|jpeg|svg|gif)', script)
-                image_urls.extend(urls)
+            # 이미지 URL 패턴 찾기 (패턴이 공백을 넘지 않으므로 스크립트들을 줄바꿈으로
+            # 이어 붙여 한 번의 findall로 처리)
+            image_urls = _IMAGE_URL_RE.findall("\n".join(script_tags))
             
             # 대안: img 태그에서 직접 추출
             if not image_urls:
-                img_tags = response.xpath('//img/@src').getall()
+                img_tags = _XP_IMG_SRC(root)
                 image_urls = [url for url in img_tags if url.startswith('http')]
             
         except Exception as e:
@@ -140,13 +151,12 @@ class AWSIconSpider(scrapy.Spider):
         image_index = response.meta.get('image_index', 0)
         
         try:
-            # 이미지 검증
+            # 이미지 검증 (크기는 open 시 헤더에서 읽히므로 verify 전에 보관해
+            # 검증 후 다시 열어 파싱하지 않음)
             img = Image.open(io.BytesIO(response.body))
+            image_width, image_height = img.size
             img.verify()
             
-            # 다시 열어서 메타데이터 추출
-            img = Image.open(io.BytesIO(response.body))
-            
             # 파일명 생성
             timestamp = int(time.time())
             filename = f"{service_name.lower()}_{source}_{image_index}_{timestamp}.png"
@@ -163,8 +173,8 @@ class AWSIconSpider(scrapy.Spider):
                 'image_url': response.url,
                 'file_path': str(file_path),
                 'file_size': len(response.body),
-                'image_width': img.width,
-                'image_height': img.height,
+                'image_width': image_width,
+                'image_height': image_height,
                 'confidence_score': 0.8 - (image_index * 0.1),
                 'search_query': search_query,
                 'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
@@ -182,7 +192,7 @@ class AWSIconSpider(scrapy.Spider):
         if self.collected_icons:
             output_file = self.output_dir / f"collected_icons_{int(time.time())}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
                 json.dump(self.collected_icons, f, ensure_ascii=False, indent=2)
             
             self.logger.info(f"수집 완료: {len(self.collected_icons)}개 아이콘을 {output_file}에 저장")
@@ -254,13 +264,12 @@ class GitHubAWSIconSpider(scrapy.Spider):
         download_url = response.meta['download_url']
         
         try:
-            # 이미지 검증
+            # 이미지 검증 (크기는 open 시 헤더에서 읽히므로 verify 전에 보관해
+            # 검증 후 다시 열어 파싱하지 않음)
             img = Image.open(io.BytesIO(response.body))
+            image_width, image_height = img.size
             img.verify()
             
-            # 다시 열어서 메타데이터 추출
-            img = Image.open(io.BytesIO(response.body))
-            
             # 파일명 생성
             safe_repo_name = repo.replace('/', '_')
             new_filename = f"github_{safe_repo_name}_{filename}"
@@ -280,8 +289,8 @@ class GitHubAWSIconSpider(scrapy.Spider):
                 'image_url': download_url,
                 'file_path': str(file_path),
                 'file_size': len(response.body),
-                'image_width': img.width,
-                'image_height': img.height,
+                'image_width': image_width,
+                'image_height': image_height,
                 'confidence_score': 0.9,  # GitHub 소스는 높은 신뢰도
                 'search_query': f"github {repo}",
                 'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
@@ -313,7 +322,7 @@ class GitHubAWSIconSpider(scrapy.Spider):
         if self.collected_icons:
             output_file = self.output_dir / f"github_icons_{int(time.time())}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
+            with open(output_file, 'w', encoding='utf-8', buffering=WRITE_BUFFER) as f:
                 json.dump(self.collected_icons, f, ensure_ascii=False, indent=2)
             
             self.logger.info(f"GitHub 수집 완료: {len(self.collected_icons)}개 아이콘을 {output_file}에 저장")
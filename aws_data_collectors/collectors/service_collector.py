@@ -3,18 +3,31 @@ AWS 서비스 정보 수집기
 boto3를 통해 AWS 서비스 메타데이터를 수집합니다.
 """
 
-import csv
-import json
+import heapq
+import multiprocessing
 import os
 import re
 import sys
+import threading
 from collections import deque
-from typing import List, Dict, Optional, Tuple, Set
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import islice
+from typing import Callable, List, Dict, Optional, Tuple, Set
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from pathlib import Path
 
 import boto3
+import pandas as pd
+import botocore
 import botocore.session
+from botocore.model import ServiceModel
+import orjson
+
+try:
+    from .io_utils import WRITE_BUFFER, cache_file_path, load_pickle_cache, resolve_cache_dir, save_pickle_cache
+except ImportError:  # 수집기 디렉터리에서 최상위 모듈로 import한 경우
+    from io_utils import WRITE_BUFFER, cache_file_path, load_pickle_cache, resolve_cache_dir, save_pickle_cache
 
 @dataclass
 class ServiceInfo:
@@ -40,6 +53,41 @@ class ResourceInfo:
     from_operation: str
     id_fields_seen: str
 
+# CSV 헤더 (데이터 클래스 필드 순서와 동일)
+_SERVICE_FIELDS = tuple(f.name for f in fields(ServiceInfo))
+_RESOURCE_FIELDS = tuple(f.name for f in fields(ResourceInfo))
+
+@dataclass(slots=True)
+class ResourceCandidate:
+    """대표 리소스 후보 (infer_resources 내부 집계용)"""
+    service_code: str
+    service_full_name: str
+    operation: str
+    list_name: str
+    element_label: str
+    representative_resource_guess: str
+    id_fields: str
+    score: int
+
+# 워커 프로세스별 수집기 (세션/모델 캐시는 프로세스마다 따로 생성)
+_worker_collector = None
+
+def _init_worker(signature: Tuple) -> None:
+    """infer_resources 워커 프로세스 초기화 (부모 수집기의 추론 설정 전체 반영)"""
+    global _worker_collector
+    collector = AWSServiceCollector()
+    max_depth, id_keys_priority, negative_hints, positive_hints = signature
+    collector.max_depth = max_depth
+    collector.id_keys_priority = id_keys_priority
+    collector.negative_hints = set(negative_hints)
+    collector.positive_hints = frozenset(positive_hints)
+    collector._refresh_infer_settings()
+    _worker_collector = collector
+
+def _process_service(code: str) -> List[ResourceCandidate]:
+    """워커 프로세스에서 단일 서비스의 대표 리소스 후보 추론"""
+    return _worker_collector._infer_one(code)
+
 class AWSServiceCollector:
     """
     AWS 서비스 정보 수집기
@@ -55,36 +103,171 @@ class AWSServiceCollector:
     ```
     """
     
-    def __init__(self):
-        """초기화"""
+    # 라벨 정규화용 정규식 (후보마다 호출되므로 미리 컴파일)
+    _ID_SUFFIX_RE = re.compile(r"(?:Names?|Arns?|Ids?)\Z")
+    _PLURAL_RE = re.compile(r"(?:ies|ses|(?<!s)s)\Z")
+    _PLURAL_REPL = {"ies": "y", "ses": "s"}
+    
+    # 캐시에 담는 서비스 메타데이터 키 (모델 전체 대신 필요한 값만 보관)
+    _METADATA_KEYS = ("serviceFullName", "endpointPrefix", "apiVersion", "uid", "protocols", "protocol")
+    
+    # 추론 규칙이 바뀌면 올려서 이전 캐시를 무효화
+    CACHE_VERSION = 1
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        초기화
+        
+        Args:
+            cache_dir: 서비스 모델 추출 결과 캐시 디렉터리 (기본값: ~/.cache/aws-archlens)
+        """
         self.session = boto3.session.Session()
         self.botocore_session = botocore.session.get_session()
         
         # 설정
         self.max_depth = 8
+        self.max_workers = os.cpu_count() or 1  # infer_resources 서비스별 병렬 처리 프로세스 수
         self.id_keys_priority = ("Arn", "Id", "Name")
         self.negative_hints = {
             "Tag", "Policy", "Quota", "Permission", "Endpoint", 
             "Error", "Limit", "Metadata"
         }
+        self.positive_hints = frozenset({
+            "instance", "bucket", "table", "function", "cluster", "queue", "topic",
+            "domain", "user", "role", "stream", "loadbalancer", "dbinstance"
+        })
+        
+        # 서비스 목록은 한 번만 계산하고 서비스 모델은 코드별로 캐시
+        # (collect_services와 infer_resources가 같은 모델을 공유)
+        self._service_codes = sorted(self.session.get_available_services())
+        self._resource_codes = set(self.session.get_available_resources())
+        self._model_cache: Dict[str, ServiceModel] = {}
+        self._model_lock = threading.Lock()
+        # 라벨 → (부정 라벨 여부, 긍정 힌트 여부) 분류 캐시
+        # (같은 라벨이 서비스/오퍼레이션 전반에 반복 등장)
+        self._label_flags_cache: Dict[str, Tuple[bool, bool]] = {}
+        self._applied_signature: Optional[Tuple] = None
+        self._refresh_infer_settings()
+        # 원본 라벨 → 정규화 라벨 캐시 (후보마다 정규식 두 번 적용 방지)
+        self._normalized_label_cache: Dict[str, str] = {}
+        
+        # botocore 버전별 디스크 캐시 (서비스 JSON 로드/파싱과 출력 shape 탐색 생략)
+        self.cache_dir = resolve_cache_dir(cache_dir)
+        self._disk_cache: Optional[Dict] = None
+        self._disk_cache_dirty = False
+        self._regions_index: Optional[Dict[str, List[str]]] = None
+    
+    @staticmethod
+    def _compile_hints(hints) -> re.Pattern:
+        """힌트 집합을 부분 문자열 검색용 정규식으로 컴파일 (긴 힌트 우선)"""
+        return re.compile("|".join(re.escape(h) for h in sorted(hints, key=len, reverse=True)))
+    
+    def _get_model(self, code: str) -> ServiceModel:
+        """서비스 모델 조회 (botocore JSON 로드 결과 캐시, 스레드 안전)"""
+        model = self._model_cache.get(code)
+        if model is None:
+            model = self.botocore_session.get_service_model(code)
+            with self._model_lock:
+                model = self._model_cache.setdefault(code, model)
+        return model
+    
+    def _service_metadata(self, code: str) -> Dict:
+        """서비스 메타데이터 조회 (디스크 캐시에 없을 때만 서비스 모델 로드)"""
+        cached = self._load_disk_cache()["metadata"]
+        md = cached.get(code)
+        if md is None:
+            metadata = self._get_model(code).metadata or {}
+            md = {k: metadata[k] for k in self._METADATA_KEYS if k in metadata}
+            cached[code] = md
+            self._disk_cache_dirty = True
+        return md
+    
+    def _regions_by_prefix(self) -> Dict[str, List[str]]:
+        """
+        endpointPrefix → 정렬된 aws 파티션 리전 목록 (endpoints.json을 한 번만 순회해 색인)
+        
+        session.get_available_regions(code)는 서비스마다 서비스 모델 JSON을 로드해
+        endpointPrefix를 얻은 뒤 파티션을 다시 훑으므로, 같은 규칙(파티션 리전에 속한
+        엔드포인트만)으로 전체 서비스를 미리 색인합니다.
+        """
+        if self._regions_index is None:
+            index = {}
+            for partition in self.botocore_session.get_data("endpoints")["partitions"]:
+                if partition["partition"] != "aws":
+                    continue
+                known = partition["regions"]
+                for prefix, service in partition["services"].items():
+                    index[prefix] = sorted(name for name in service.get("endpoints", {}) if name in known)
+            self._regions_index = index
+        return self._regions_index
+    
+    def _infer_signature(self) -> Tuple:
+        """리소스 추론 결과에 영향을 주는 설정 (캐시 키이자 워커 초기화 인자)"""
+        return (self.max_depth, tuple(self.id_keys_priority),
+                tuple(sorted({h.lower() for h in self.negative_hints})),
+                tuple(sorted(self.positive_hints)))
+    
+    def _refresh_infer_settings(self) -> Tuple:
+        """
+        현재 설정 속성에서 파생 상태 재계산 (설정이 바뀐 경우에만)
+        
+        Returns:
+            Tuple: 적용된 _infer_signature() 결과
+        """
+        signature = self._infer_signature()
+        if signature == self._applied_signature:
+            return signature
+        _, id_keys_priority, negative_lower, positive_hints = signature
+        
+        # 힌트는 소문자로 한 번만 정규화하고, 라벨당 한 번의
+        # 검색으로 끝나도록 alternation 정규식으로 컴파일
+        self._negative_re = self._compile_hints(negative_lower)
+        self._positive_re = self._compile_hints(positive_hints)
+        # op_bonus를 제외한 후보 점수 상한 (식별자 종류마다 3 + 긍정 힌트 1)
+        self._max_shape_score = 3 * len(id_keys_priority) + 1
+        self._label_flags_cache.clear()
+        self._applied_signature = signature
+        return signature
     
-    def collect_services(self) -> List[ServiceInfo]:
+    def _cache_path(self) -> Path:
+        """botocore 버전으로 만든 캐시 파일 경로 (서비스 모델이 바뀌면 새 파일)"""
+        return cache_file_path(self.cache_dir, "models", self.CACHE_VERSION, botocore.__version__)
+    
+    def _load_disk_cache(self) -> Dict:
+        """디스크 캐시 로드 (처음 한 번만, 없거나 손상되었으면 빈 캐시)"""
+        if self._disk_cache is None:
+            self._disk_cache = (load_pickle_cache(self._cache_path(), "서비스 모델 캐시")
+                                or {"metadata": {}, "resources": {}})
+        return self._disk_cache
+    
+    def _save_disk_cache(self) -> None:
+        """변경된 캐시를 저장 (실패해도 수집은 계속)"""
+        if self._disk_cache_dirty and save_pickle_cache(self._cache_path(), self._disk_cache, "서비스 모델 캐시"):
+            self._disk_cache_dirty = False
+    
+    def collect_services(self, *, predicate: Optional[Callable[[str], bool]] = None,
+                         limit: Optional[int] = None) -> List[ServiceInfo]:
         """
         AWS 서비스 메타데이터 수집
         
+        Args:
+            predicate: 서비스 코드 필터 (False인 코드는 모델 로드 없이 건너뜀)
+            limit: 최대 수집 서비스 수 (도달 시 조기 종료)
+            
         Returns:
             List[ServiceInfo]: 서비스 정보 리스트
         """
         print("🔍 AWS 서비스 메타데이터 수집 중...")
         
-        service_codes = sorted(self.session.get_available_services())
-        resource_codes = set(self.session.get_available_resources())
-        
         services = []
-        for code in service_codes:
+        for code in self._service_codes:
+            if limit is not None and len(services) >= limit:
+                break
+            if predicate is not None and not predicate(code):
+                continue
+            
             try:
-                model = self.botocore_session.get_service_model(code)
-                md = model.metadata or {}
+                md = self._service_metadata(code)
                 
                 full_name = md.get("serviceFullName") or code
                 endpoint_prefix = md.get("endpointPrefix") or code
@@ -96,9 +279,9 @@ class AWSServiceCollector:
                 if isinstance(protos, list):
                     protos = ",".join(sorted(protos))
                 
-                # 리전 정보
-                regions = sorted(self.session.get_available_regions(code))
-                has_resources = code in resource_codes
+                # 리전 정보 (endpointPrefix 기준 색인, 서비스 모델 로드 없음)
+                regions = self._regions_by_prefix().get(md.get("endpointPrefix") or code, [])
+                has_resources = code in self._resource_codes
                 is_global = len(regions) == 0
                 
                 service_info = ServiceInfo(
@@ -119,66 +302,63 @@ class AWSServiceCollector:
                 print(f"⚠️ 서비스 {code} 처리 실패: {e}")
                 continue
         
+        self._save_disk_cache()
         print(f"✅ 수집된 서비스: {len(services)}개")
         return services
     
-    def infer_resources(self) -> List[ResourceInfo]:
+    def infer_resources(self, *, predicate: Optional[Callable[[str], bool]] = None,
+                        limit: Optional[int] = None) -> List[ResourceInfo]:
         """
         서비스별 대표 리소스 추론
         
+        Args:
+            predicate: 서비스 코드 필터 (False인 코드는 모델 로드 없이 건너뜀)
+            limit: 최대 탐색 서비스 수
+            
         Returns:
             List[ResourceInfo]: 리소스 정보 리스트
         """
         print("🔍 AWS 서비스 대표 리소스 추론 중...")
         
-        service_codes = sorted(self.session.get_available_services())
+        codes = self._service_codes
+        if predicate is not None:
+            codes = filter(predicate, codes)
+        codes = list(islice(codes, limit))
+        
         rows = []
         
-        for code in service_codes:
-            try:
-                model = self.botocore_session.get_service_model(code)
-                md = model.metadata or {}
-                full_name = md.get("serviceFullName") or code
-                ops = model.operation_names
-                
-                candidates = []
-                for op_name in ops:
+        # 이전 실행에서 같은 botocore/같은 설정으로 추론한 서비스는 캐시 사용
+        cached = self._load_disk_cache()["resources"]
+        signature = self._refresh_infer_settings()
+        pending = []
+        for code in codes:
+            hit = cached.get((code, signature))
+            if hit is None:
+                pending.append(code)
+            else:
+                rows.extend(hit)
+        
+        # 서비스별 탐색은 서로 독립적인 순수 파이썬 CPU 작업이므로 GIL을 피해
+        # 프로세스로 병렬 처리 (집계/정렬은 단일 프로세스). collect_all이 다른
+        # 수집기 스레드와 함께 호출하므로 fork 대신 spawn으로 워커 생성
+        # (다른 스레드가 잡고 있던 락이 자식 프로세스에 복사되어 멈추는 문제 방지)
+        if pending:
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ProcessPoolExecutor(max_workers=workers,
+                                     mp_context=multiprocessing.get_context("spawn"),
+                                     initializer=_init_worker,
+                                     initargs=(signature,)) as executor:
+                futures = {executor.submit(_process_service, code): code for code in pending}
+                for future in as_completed(futures):
                     try:
-                        op = model.operation_model(op_name)
-                        output_shape = op.output_shape
-                    except Exception:
+                        top = future.result()
+                    except Exception as e:
+                        print(f"⚠️ 서비스 {futures[future]} 리소스 추론 실패: {e}")
                         continue
-                    
-                    if output_shape is None:
-                        continue
-                    
-                    for path, list_name, elem_label, id_fields in self._walk_output_shape(output_shape):
-                        # 후보 라벨 만들기
-                        label = self._normalize_resource_label(elem_label or list_name)
-                        score = self._score_candidate(op_name, list_name, label, id_fields)
-                        
-                        if score <= 0:
-                            continue
-                        
-                        candidates.append({
-                            "service_code": code,
-                            "service_full_name": full_name,
-                            "operation": op_name,
-                            "list_name": list_name,
-                            "element_label": elem_label,
-                            "representative_resource_guess": label,
-                            "id_fields": ";".join(sorted(id_fields)),
-                            "score": score,
-                        })
-                
-                # 상위 3개만 남김
-                candidates.sort(key=lambda x: (-x["score"], x["representative_resource_guess"]))
-                top = candidates[:3] if candidates else []
-                rows.extend(top)
-                
-            except Exception as e:
-                print(f"⚠️ 서비스 {code} 리소스 추론 실패: {e}")
-                continue
+                    rows.extend(top)
+                    cached[(futures[future], signature)] = top
+            self._disk_cache_dirty = True
+        self._save_disk_cache()
         
         # 서비스당 1~3개 대표 리소스로 집계
         aggregated = self._aggregate_resources(rows)
@@ -186,65 +366,166 @@ class AWSServiceCollector:
         print(f"✅ 추론된 리소스: {len(aggregated)}개 서비스")
         return aggregated
     
-    def _walk_output_shape(self, output_shape) -> List[Tuple]:
+    def _infer_one(self, code: str) -> List[ResourceCandidate]:
         """
-        순환 안전한 BFS로 출력 형태 탐색
+        단일 서비스의 대표 리소스 후보 추론
+        
+        Args:
+            code: 서비스 코드
+            
+        Returns:
+            List[ResourceCandidate]: 점수 상위 3개 후보
+        """
+        model = self._get_model(code)
+        md = model.metadata or {}
+        full_name = md.get("serviceFullName") or code
+        ops = model.operation_names
+        
+        # 후보는 가벼운 튜플 (점수, 라벨, 오퍼레이션, 리스트명, 요소라벨, 식별자필드)로만
+        # 모으고, 데이터 클래스와 id 필드 문자열은 상위 3개에 대해서만 생성
+        candidates = []
+        shape_cache: Dict[str, Tuple] = {}  # 오퍼레이션 간 공유 shape 해석 캐시
+        # 지금까지의 상위 3개 점수 (최소 힙, top_scores[0]이 3위 점수)
+        top_scores: List[int] = []
+        for op_name in ops:
+            # 오퍼레이션 네이밍 가중치는 오퍼레이션당 한 번만 계산
+            op_bonus = 1 if op_name.lower().startswith(("list", "describe")) else 0
+            
+            # 분기 한정: 이 오퍼레이션 후보의 최고 가능 점수가 현재 3위보다 낮으면
+            # 출력 shape 탐색 생략 (3위 점수는 줄지 않으므로 결과 불변)
+            if len(top_scores) == 3 and op_bonus + self._max_shape_score < top_scores[0]:
+                continue
+            
+            try:
+                op = model.operation_model(op_name)
+                output_shape = op.output_shape
+            except Exception:
+                continue
+            
+            if output_shape is None:
+                continue
+            
+            for _parent, list_name, elem_label, id_fields, id_kinds in self._walk_output_shape(output_shape, shape_cache):
+                # 후보 라벨 만들기
+                label = self._normalize_resource_label(elem_label or list_name)
+                score = self._score_candidate(op_bonus, list_name, label, id_kinds)
+                
+                if score <= 0:
+                    continue
+                
+                candidates.append((score, label, op_name, list_name, elem_label, id_fields))
+                if len(top_scores) < 3:
+                    heapq.heappush(top_scores, score)
+                elif score > top_scores[0]:
+                    heapq.heapreplace(top_scores, score)
+        
+        # 상위 3개만 남김 (전체 정렬 대신 부분 선택, sorted(...)[:3]과 동일한 순서)
+        top = heapq.nsmallest(3, candidates, key=lambda c: (-c[0], c[1]))
+        return [
+            ResourceCandidate(
+                service_code=code,
+                service_full_name=full_name,
+                operation=op_name,
+                list_name=list_name,
+                element_label=elem_label,
+                representative_resource_guess=label,
+                id_fields=";".join(sorted(id_fields)),
+                score=score,
+            )
+            for score, label, op_name, list_name, elem_label, id_fields in top
+        ]
+    
+    def _walk_output_shape(self, output_shape,
+                           shape_cache: Optional[Dict[str, Tuple]] = None) -> List[Tuple]:
+        """
+        깊이 제한 BFS로 출력 형태 탐색
         
         Args:
             output_shape: botocore 형태 객체
+            shape_cache: 서비스 단위 shape 이름 → 해석 결과 캐시
+                (오퍼레이션 간 공유되는 구조체/리스트를 한 번만 해석)
             
         Yields:
-            Tuple: (경로, 리스트명, 요소라벨, 식별자필드집합)
+            Tuple: (부모 멤버명, 리스트명, 요소라벨, 식별자필드집합, 식별자 종류 수)
         """
         if output_shape is None:
             return
+        if shape_cache is None:
+            shape_cache = {}
         
-        seen = set()  # shape 객체 id 단위로 방문 제어
+        # 같은 이름의 shape는 캐시된 객체를 공유하므로 id 기반 방문 제어 대신
+        # max_depth로 순환(재귀 구조체)을 끊음
         queue = deque()
-        queue.append(((), output_shape, 0))  # (경로, shape, depth)
+        # 경로 튜플 대신 직전 멤버 이름만 보관 (list_name 용도로만 쓰임)
+        queue.append(("", output_shape, 0))  # (부모 멤버명, shape, depth)
         
         while queue:
-            path, shape, depth = queue.popleft()
+            parent_name, shape, depth = queue.popleft()
             if shape is None:
                 continue
             
-            sid = id(shape)
-            if sid in seen:
-                continue
-            seen.add(sid)
-            
             if depth > self.max_depth:
                 continue
             
             t = shape.type_name
             if t == "structure":
                 # ResponseMetadata/토큰류는 패스
-                for name, member in (shape.members or {}).items():
-                    if name in ("ResponseMetadata", "NextToken", "Marker", "NextMarker", "ContinuationToken"):
-                        continue
-                    queue.append((path + (name,), member, depth + 1))
+                for name, member in self._resolve_shape(shape, shape_cache):
+                    queue.append((name, member, depth + 1))
             
             elif t == "list":
-                elem = self._safe_get_member(shape)
-                list_name = path[-1] if path else "Items"
+                list_name = parent_name or "Items"
+                elem, elem_label, id_fields, id_kinds = self._resolve_shape(shape, shape_cache)
                 
                 if elem is None:
                     continue
                 
-                if elem.type_name == "structure":
-                    # 구조체 원소 → 식별자 필드 수집
-                    id_fields = set(
-                        fname for fname, fshape in (elem.members or {}).items()
-                        if fname.endswith(self.id_keys_priority)
-                    )
-                    elem_label = elem.name or "Item"
-                    yield (path, list_name, elem_label, id_fields)
+                if id_fields is not None:
+                    # 구조체 원소 → 식별자 필드
+                    yield (parent_name, list_name, elem_label, id_fields, id_kinds)
                     # 중첩(예: Reservations -> Instances) 탐색
-                    queue.append((path, elem, depth + 1))
+                    queue.append((parent_name, elem, depth + 1))
                 else:
                     # 스칼라 리스트(예: TableNames: [string])도 대표 리소스로 취급
                     rep = self._normalize_resource_label(list_name)
-                    yield (path, list_name, rep, {rep + "Name"})
+                    yield (parent_name, list_name, rep, {rep + "Name"}, 1)
+    
+    def _resolve_shape(self, shape, shape_cache: Dict[str, Tuple]) -> Tuple:
+        """
+        구조체/리스트 shape 해석 결과 조회 (shape 이름 단위 캐시)
+        
+        botocore는 멤버에 접근할 때마다 새 Shape 객체를 만들므로, 여러
+        오퍼레이션이 공유하는 shape를 서비스 내에서 한 번만 해석합니다.
+        
+        Returns:
+            Tuple: 구조체면 (멤버명, 멤버 shape) 목록,
+                리스트면 (원소 shape, 원소 라벨, 식별자필드집합 또는 None,
+                식별자 종류 수)
+        """
+        key = shape.name
+        cached = shape_cache.get(key) if key else None
+        if cached is not None:
+            return cached
+        
+        if shape.type_name == "structure":
+            cached = tuple(
+                (name, member) for name, member in (shape.members or {}).items()
+                if name not in ("ResponseMetadata", "NextToken", "Marker", "NextMarker", "ContinuationToken")
+            )
+        else:
+            elem = self._safe_get_member(shape)
+            if elem is not None and elem.type_name == "structure":
+                id_fields = frozenset(
+                    fname for fname in (elem.members or {})
+                    if fname.endswith(self.id_keys_priority)
+                )
+                cached = (elem, elem.name or "Item", id_fields, self._id_kinds(id_fields))
+            else:
+                cached = (elem, None, None, 0)
+        
+        if key:
+            shape_cache[key] = cached
+        return cached
     
     def _safe_get_member(self, shape):
         """안전한 멤버 접근"""
@@ -260,68 +541,87 @@ class AWSServiceCollector:
         if not label:
             return "Item"
         
-        # 단수화
-        l = self._singularize(label)
+        cached = self._normalized_label_cache.get(label)
+        if cached is not None:
+            return cached
         
-        # TableNames -> Table, FunctionArns -> Function 등 휴리스틱
-        for suffix in ("Names", "Name", "Arns", "Arn", "Ids", "Id"):
-            if l.endswith(suffix):
-                l = l[:-len(suffix)]
-                break
+        # 단수화 후 TableNames -> Table, FunctionArns -> Function 등 휴리스틱
+        l = self._ID_SUFFIX_RE.sub("", self._singularize(label), count=1) or "Item"
         
-        return l or "Item"
+        self._normalized_label_cache[label] = l
+        return l
     
     def _singularize(self, name: str) -> str:
         """간단한 단수화 휴리스틱"""
         if not name:
             return name
-        if name.endswith("ies"):
-            return name[:-3] + "y"
-        if name.endswith("ses"):
-            return name[:-2]
-        if name.endswith("s") and not name.endswith("ss"):
-            return name[:-1]
-        return name
+        # ies -> y, ses -> s, s -> "" (단, ss로 끝나면 유지)
+        return self._PLURAL_RE.sub(
+            lambda m: self._PLURAL_REPL.get(m.group(0), ""), name, count=1
+        )
     
     def _is_negative_label(self, label: str) -> bool:
         """부정적인 라벨인지 확인"""
         s = (label or "").lower()
-        return any(k.lower() in s for k in self.negative_hints)
+        return self._negative_re.search(s) is not None
     
-    def _score_candidate(self, op_name: str, list_name: str, 
-                        elem_label: str, id_fields: Set[str]) -> int:
-        """후보 점수 계산"""
-        score = 0
+    def _label_flags(self, label: str) -> Tuple[bool, bool]:
+        """라벨 분류 결과 (부정 라벨 여부, 긍정 힌트 여부), 라벨별 캐시"""
+        flags = self._label_flags_cache.get(label)
+        if flags is None:
+            flags = (
+                self._is_negative_label(label),
+                self._positive_re.search((label or "").lower()) is not None,
+            )
+            self._label_flags_cache[label] = flags
+        return flags
+    
+    def _id_kinds(self, id_fields) -> int:
+        """식별자 필드에 나타난 종류(id_keys_priority 접미사) 수 (shape 해석 시 한 번만 계산)"""
+        matched = 0
+        for f in id_fields:
+            for bit, key in enumerate(self.id_keys_priority):
+                if f.endswith(key):
+                    matched |= 1 << bit
+                    break
+        return matched.bit_count()
+    
+    def _score_candidate(self, op_bonus: int, list_name: str, 
+                        elem_label: str, id_kinds: int) -> int:
+        """
+        후보 점수 계산
         
-        # 식별자 가중치
-        keys = [k for k in self.id_keys_priority 
-                if any(f.endswith(k) for f in id_fields)]
-        score += 3 * len(keys)
+        Args:
+            op_bonus: 오퍼레이션 네이밍 가중치 (List*/Describe*면 1)
+            list_name: 리스트 멤버 이름
+            elem_label: 정규화된 리소스 라벨
+            id_kinds: 식별자 종류 수 (_id_kinds 결과)
+            
+        Returns:
+            int: 후보 점수
+        """
+        # 식별자 가중치 (종류 수는 shape별로 미리 계산되어 정수 연산만 남음)
+        score = op_bonus + 3 * id_kinds
         
-        # 오퍼레이션 네이밍
-        if (op_name or "").lower().startswith(("list", "describe")):
-            score += 1
+        elem_negative, elem_positive = self._label_flags(elem_label)
+        list_negative, _ = self._label_flags(list_name)
         
         # 라벨 클린
-        if self._is_negative_label(elem_label) or self._is_negative_label(list_name):
+        if elem_negative or list_negative:
             score -= 3
         
         # 직관 이름 보너스
-        positive_hints = {
-            "instance", "bucket", "table", "function", "cluster", "queue", "topic",
-            "domain", "user", "role", "stream", "loadbalancer", "dbinstance"
-        }
-        if any(k in (elem_label or "").lower() for k in positive_hints):
+        if elem_positive:
             score += 1
         
         return score
     
-    def _aggregate_resources(self, rows: List[Dict]) -> List[ResourceInfo]:
+    def _aggregate_resources(self, rows: List[ResourceCandidate]) -> List[ResourceInfo]:
         """리소스 정보 집계"""
         # 서비스별로 그룹화
         aggregated = {}
         for row in rows:
-            key = (row["service_code"], row["service_full_name"])
+            key = (row.service_code, row.service_full_name)
             if key not in aggregated:
                 aggregated[key] = []
             aggregated[key].append(row)
@@ -329,17 +629,17 @@ class AWSServiceCollector:
         # 각 서비스별로 상위 리소스 선택
         final = []
         for (code, name), lst in aggregated.items():
-            lst = sorted(lst, key=lambda x: -x["score"])
+            lst = sorted(lst, key=lambda x: -x.score)
             main = lst[0]
-            secondary = [x["representative_resource_guess"] for x in lst[1:]]
+            secondary = [x.representative_resource_guess for x in lst[1:]]
             
             resource_info = ResourceInfo(
                 service_code=code,
                 service_full_name=name,
-                main_resource_example=main["representative_resource_guess"],
+                main_resource_example=main.representative_resource_guess,
                 secondary_examples=";".join(secondary),
-                from_operation=main["operation"],
-                id_fields_seen=main["id_fields"]
+                from_operation=main.operation,
+                id_fields_seen=main.id_fields
             )
             final.append(resource_info)
         
@@ -350,87 +650,68 @@ class AWSServiceCollector:
     def save_services(self, services: List[ServiceInfo], 
                      csv_path: str, json_path: str) -> None:
         """서비스 정보 저장"""
-        # 출력 디렉터리 생성
-        Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
-        Path(json_path).parent.mkdir(parents=True, exist_ok=True)
-        
-        # JSON 저장
-        json_data = []
-        for service in services:
-            json_data.append({
-                "service_code": service.service_code,
-                "service_full_name": service.service_full_name,
-                "endpoint_prefix": service.endpoint_prefix,
-                "api_version": service.api_version,
-                "protocols": service.protocols,
-                "uid": service.uid,
-                "regions": service.regions,
-                "region_count": service.region_count,
-                "is_global_like": service.is_global_like,
-                "has_resource_interface": service.has_resource_interface,
-            })
-        
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
-        
-        # CSV 저장
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=list(json_data[0].keys()))
-            w.writeheader()
-            w.writerows(json_data)
-        
+        self._stream_save(services, _SERVICE_FIELDS, csv_path, json_path)
         print(f"✅ 서비스 정보 저장: {csv_path} / {json_path}")
     
     def save_resources(self, resources: List[ResourceInfo], 
                       csv_path: str, json_path: str) -> None:
         """리소스 정보 저장"""
+        self._stream_save(resources, _RESOURCE_FIELDS, csv_path, json_path)
+        print(f"✅ 리소스 정보 저장: {csv_path} / {json_path}")
+    
+    def _stream_save(self, items: List, field_names: Tuple[str, ...], 
+                     csv_path: str, json_path: str) -> None:
+        """
+        데이터 클래스 목록을 JSON/CSV로 기록
+        
+        CSV는 필드별 열 리스트로 DataFrame을 만들어 pandas C 경로로 한 번에 쓰고,
+        JSON은 원소마다 데이터 클래스를 직접 직렬화해 바로 씁니다
+        (행마다 dict를 만들지 않으며, 결과는 indent=2로 한 번에 덤프한 것과 동일).
+        
+        Args:
+            items: ServiceInfo/ResourceInfo 목록
+            field_names: CSV 헤더 (데이터 클래스 필드 순서)
+            csv_path: CSV 출력 경로
+            json_path: JSON 출력 경로
+        """
         # 출력 디렉터리 생성
         Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
         Path(json_path).parent.mkdir(parents=True, exist_ok=True)
         
-        # JSON 저장
-        json_data = []
-        for resource in resources:
-            json_data.append({
-                "service_code": resource.service_code,
-                "service_full_name": resource.service_full_name,
-                "main_resource_example": resource.main_resource_example,
-                "secondary_examples": resource.secondary_examples,
-                "from_operation": resource.from_operation,
-                "id_fields_seen": resource.id_fields_seen,
-            })
-        
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
-        
-        # CSV 저장
-        fieldnames = [
-            "service_code", "service_full_name", "main_resource_example",
-            "secondary_examples", "from_operation", "id_fields_seen"
-        ]
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            w = csv.DictWriter(f, fieldnames=fieldnames)
-            w.writeheader()
-            for resource in resources:
-                w.writerow({
-                    "service_code": resource.service_code,
-                    "service_full_name": resource.service_full_name,
-                    "main_resource_example": resource.main_resource_example,
-                    "secondary_examples": resource.secondary_examples,
-                    "from_operation": resource.from_operation,
-                    "id_fields_seen": resource.id_fields_seen,
-                })
+        # 행 단위 dict 대신 필드별 열 리스트 (SoA)
+        columns = {name: list(map(attrgetter(name), items)) for name in field_names}
+        with open(csv_path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER) as f_csv:
+            pd.DataFrame(columns, columns=list(field_names)).to_csv(
+                f_csv, index=False, lineterminator="\r\n"
+            )
         
-        print(f"✅ 리소스 정보 저장: {csv_path} / {json_path}")
+        with open(json_path, "wb", buffering=WRITE_BUFFER) as f_json:
+            sep = b"[\n  "
+            for item in items:
+                # orjson은 데이터 클래스를 필드 순서대로 직접 직렬화
+                obj = orjson.dumps(item, option=orjson.OPT_INDENT_2)
+                # 배열 원소 한 단계 들여쓰기 (문자열 내 개행은 이스케이프되어 안전)
+                f_json.write(sep)
+                f_json.write(obj.replace(b"\n", b"\n  "))
+                sep = b",\n  "
+            
+            f_json.write(b"\n]" if items else b"[]")
     
     def get_statistics(self, services: List[ServiceInfo], 
                       resources: List[ResourceInfo]) -> Dict:
         """통계 정보"""
+        # 한 번의 순회로 집계
+        global_count = resource_count = region_total = 0
+        for s in services:
+            global_count += s.is_global_like
+            resource_count += s.has_resource_interface
+            region_total += s.region_count
+        
         stats = {
             "total_services": len(services),
             "total_resources": len(resources),
-            "global_services": len([s for s in services if s.is_global_like]),
-            "resource_services": len([s for s in services if s.has_resource_interface]),
-            "avg_regions": sum(s.region_count for s in services) / len(services) if services else 0
+            "global_services": global_count,
+            "resource_services": resource_count,
+            "avg_regions": region_total / len(services) if services else 0
         }
         return stats
@@ -4,13 +4,17 @@
 기존 ZIP 파일과 더미 아이콘 생성을 통해 훈련 데이터셋을 보강합니다.
 """
 
-import json
+import os
 import time
 import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass, fields
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
+import orjson
 import random
 
 @dataclass
@@ -27,6 +31,9 @@ class IconData:
     search_query: str
     timestamp: str
 
+# 직렬화용 필드명 (asdict의 재귀 deepcopy 없이 얕은 dict 변환)
+_ICON_FIELDS = tuple(f.name for f in fields(IconData))
+
 class SimpleIconCollector:
     """
     간단한 AWS 아이콘 수집기
@@ -35,9 +42,12 @@ class SimpleIconCollector:
     훈련 데이터셋을 보강합니다.
     """
     
+    ICON_SIZE = (128, 128)  # 생성되는 더미 아이콘 크기
+    
     def __init__(self, output_dir: str = "collected_icons"):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.max_workers = os.cpu_count() or 4  # 더미 아이콘 생성 워커 수
         
         # AWS 서비스 목록
         self.aws_services = [
@@ -59,6 +69,16 @@ class SimpleIconCollector:
             '#FFEAA7', '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE',
             '#85C1E9', '#F8C471', '#82E0AA', '#F1948A', '#85C1E9'
         ]
+        
+        # 더미 아이콘 템플릿 (흰 배경 + 검은 테두리)과 폰트는 한 번만 준비
+        self._base_icon = Image.new('RGB', self.ICON_SIZE, color='white')
+        ImageDraw.Draw(self._base_icon).rectangle([20, 20, 108, 108], outline='black', width=2)
+        try:
+            self._font = ImageFont.load_default()
+        except Exception:
+            self._font = None
+        # 라벨 텍스트 → 가운데 정렬 좌표 캐시 (폰트가 고정이라 텍스트별로 한 번만 측정)
+        self._text_origin: Dict[str, Tuple[int, int]] = {}
     
     def extract_from_zip(self, zip_path: str) -> List[IconData]:
         """ZIP 파일에서 아이콘 추출"""
@@ -67,28 +87,31 @@ class SimpleIconCollector:
         icons = []
         
         try:
-            with zipfile.ZipFile(zip_path) as z:
-                # SVG 파일들 찾기
-                svg_files = [f for f in z.namelist() if f.endswith('.svg')]
-                
-                for svg_file in svg_files[:50]:  # 상위 50개만 처리
+            with zipfile.ZipFile(zip_path, 'r', allowZip64=True) as z:
+                # SVG 파일을 한 번만 훑으며 상위 50개만 처리
+                count = 0
+                for info in z.infolist():
+                    if not info.filename.endswith('.svg'):
+                        continue
+                    if count >= 50:
+                        break
+                    count += 1
+                    
+                    svg_file = info.filename
                     try:
                         # 파일명에서 서비스명 추출
                         service_name = self.extract_service_from_path(svg_file)
                         
-                        # SVG 파일 내용 읽기
-                        content = z.read(svg_file)
-                        
-                        # PNG로 변환하여 저장
-                        png_path = self.convert_svg_to_png(content, service_name)
+                        # PNG로 변환하여 저장 (현재 변환은 SVG 내용을 쓰지 않으므로
+                        # 압축 해제 없이 진행)
+                        png_path = self.convert_svg_to_png(None, service_name)
                         
                         if png_path:
                             # 파일 정보 가져오기
                             file_size = png_path.stat().st_size
                             
-                            # 이미지 크기 확인
-                            with Image.open(png_path) as img:
-                                width, height = img.size
+                            # 이미지 크기 (방금 생성한 더미 아이콘이므로 고정)
+                            width, height = self.ICON_SIZE
                             
                             icon_data = IconData(
                                 service_name=service_name,
@@ -135,7 +158,7 @@ class SimpleIconCollector:
         
         return service_name.title()
     
-    def convert_svg_to_png(self, svg_content: bytes, service_name: str) -> Optional[Path]:
+    def convert_svg_to_png(self, svg_content: Optional[bytes], service_name: str) -> Optional[Path]:
         """SVG를 PNG로 변환"""
         try:
             # 간단한 PNG 생성 (실제 SVG 변환은 복잡하므로 더미 생성)
@@ -145,81 +168,84 @@ class SimpleIconCollector:
             return None
     
     def create_dummy_icons(self, services: List[str], count_per_service: int = 3) -> List[IconData]:
-        """더미 아이콘 생성"""
+        """더미 아이콘 생성 (PNG 인코딩은 GIL을 놓으므로 스레드 풀로 병렬 처리)"""
         print(f"더미 아이콘 생성 중: {len(services)}개 서비스, 서비스당 {count_per_service}개")
         
         icons = []
         
-        for service in services:
-            for i in range(count_per_service):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            jobs = [
+                (service, pool.submit(self._create_dummy_icon_data, service, i))
+                for service in services
+                for i in range(count_per_service)
+            ]
+            
+            # 제출 순서대로 결과 수집 (출력 순서 유지)
+            for service, future in jobs:
                 try:
-                    # 더미 아이콘 생성
-                    icon_path = self.create_dummy_icon(service, f"dummy_{i}")
-                    
-                    if icon_path:
-                        # 파일 정보 가져오기
-                        file_size = icon_path.stat().st_size
-                        
-                        # 이미지 크기 확인
-                        with Image.open(icon_path) as img:
-                            width, height = img.size
-                        
-                        icon_data = IconData(
-                            service_name=service,
-                            source_url="dummy_generated",
-                            image_url=f"dummy://{service}_{i}",
-                            file_path=str(icon_path),
-                            file_size=file_size,
-                            image_width=width,
-                            image_height=height,
-                            confidence_score=0.6,  # 더미 데이터는 중간 신뢰도
-                            search_query=f"AWS {service} icon",
-                            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
-                        )
-                        
-                        icons.append(icon_data)
-                        print(f"  생성 완료: {service} - {icon_path.name}")
+                    icon_data = future.result()
+                    icons.append(icon_data)
+                    print(f"  생성 완료: {service} - {Path(icon_data.file_path).name}")
                 
                 except Exception as e:
                     print(f"  생성 실패: {service} - {e}")
         
         return icons
     
+    def _create_dummy_icon_data(self, service: str, i: int) -> IconData:
+        """더미 아이콘 한 개 생성 후 메타데이터 반환 (워커 스레드에서 실행)"""
+        icon_path = self.create_dummy_icon(service, f"dummy_{i}")
+        
+        # 파일 정보 가져오기
+        file_size = icon_path.stat().st_size
+        
+        # 이미지 크기 (방금 생성한 더미 아이콘이므로 고정)
+        width, height = self.ICON_SIZE
+        
+        return IconData(
+            service_name=service,
+            source_url="dummy_generated",
+            image_url=f"dummy://{service}_{i}",
+            file_path=str(icon_path),
+            file_size=file_size,
+            image_width=width,
+            image_height=height,
+            confidence_score=0.6,  # 더미 데이터는 중간 신뢰도
+            search_query=f"AWS {service} icon",
+            timestamp=time.strftime("%Y-%m-%d %H:%M:%S")
+        )
+    
     def create_dummy_icon(self, service_name: str, suffix: str) -> Path:
         """개별 더미 아이콘 생성"""
-        # 128x128 크기의 이미지 생성
-        img = Image.new('RGB', (128, 128), color='white')
+        # 128x128 템플릿 복사
+        img = self._base_icon.copy()
         draw = ImageDraw.Draw(img)
         
         # 랜덤 색상 선택
         color = random.choice(self.colors)
         
         # 간단한 아이콘 그리기 (사각형과 텍스트)
-        draw.rectangle([20, 20, 108, 108], outline='black', width=2)
         draw.rectangle([30, 30, 98, 98], fill=color)
         
         # 서비스명 텍스트 추가
-        try:
-            font = ImageFont.load_default()
-        except:
-            font = None
-        
+        font = self._font
         text = service_name[:8]  # 텍스트 길이 제한
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        x = (128 - text_width) // 2
-        y = (128 - text_height) // 2
-        draw.text((x, y), text, fill='black', font=font)
+        origin = self._text_origin.get(text)
+        if origin is None:
+            bbox = draw.textbbox((0, 0), text, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+            origin = ((128 - text_width) // 2, (128 - text_height) // 2)
+            self._text_origin[text] = origin
+        draw.text(origin, text, fill='black', font=font)
         
         # 파일명 생성
         timestamp = int(time.time())
         filename = f"{service_name.lower()}_{suffix}_{timestamp}.png"
         file_path = self.output_dir / filename
         
-        # 파일 저장
-        img.save(file_path, 'PNG')
+        # 파일 저장 (학습 보강용 더미라 압축률보다 인코딩 속도 우선)
+        img.save(file_path, 'PNG', compress_level=1, optimize=False)
         
         return file_path
     
@@ -246,40 +272,33 @@ class SimpleIconCollector:
         """수집된 아이콘 데이터 저장"""
         output_path = self.output_dir / output_file
         
-        # JSON으로 저장
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump([asdict(icon) for icon in icons], f, ensure_ascii=False, indent=2)
+        # JSON으로 저장 (orjson으로 직렬화)
+        with open(output_path, 'wb') as f:
+            records = [{k: getattr(icon, k) for k in _ICON_FIELDS} for icon in icons]
+            f.write(orjson.dumps(records, option=orjson.OPT_INDENT_2))
         
         print(f"[OK] 수집된 아이콘 저장: {output_path} (총 {len(icons)}개)")
     
     def get_statistics(self, icons: List[IconData]) -> Dict:
         """수집된 아이콘 통계"""
+        n = len(icons)
+        sizes = np.fromiter((icon.file_size for icon in icons), dtype=np.int64, count=n)
+        scores = np.fromiter((icon.confidence_score for icon in icons), dtype=np.float64, count=n)
+        
         stats = {
-            "total_icons": len(icons),
-            "services": {},
-            "sources": {},
-            "file_sizes": [],
-            "confidence_scores": []
+            "total_icons": n,
+            # 서비스/소스별 통계
+            "services": dict(Counter(icon.service_name for icon in icons)),
+            "sources": dict(Counter(icon.source_url for icon in icons)),
+            # 파일 크기/신뢰도 점수 통계
+            "file_sizes": sizes.tolist(),
+            "confidence_scores": scores.tolist()
         }
         
-        for icon in icons:
-            # 서비스별 통계
-            stats["services"][icon.service_name] = stats["services"].get(icon.service_name, 0) + 1
-            
-            # 소스별 통계
-            stats["sources"][icon.source_url] = stats["sources"].get(icon.source_url, 0) + 1
-            
-            # 파일 크기 통계
-            stats["file_sizes"].append(icon.file_size)
-            
-            # 신뢰도 점수 통계
-            stats["confidence_scores"].append(icon.confidence_score)
-        
         # 평균 계산
-        if stats["file_sizes"]:
-            stats["avg_file_size"] = sum(stats["file_sizes"]) / len(stats["file_sizes"])
-        if stats["confidence_scores"]:
-            stats["avg_confidence"] = sum(stats["confidence_scores"]) / len(stats["confidence_scores"])
+        if n:
+            stats["avg_file_size"] = float(sizes.mean())
+            stats["avg_confidence"] = float(scores.mean())
         
         return stats
     
@@ -3,15 +3,27 @@ AWS 데이터 수집기 메인 모듈
 세 가지 수집기를 통합하여 AWS 관련 데이터를 수집합니다.
 """
 
+import copy
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 import yaml
 
-from collectors.icon_collector import AWSIconCollector
-from collectors.product_collector import AWSProductCollector
-from collectors.service_collector import AWSServiceCollector
+# libyaml이 있으면 C 로더 사용 (순수 파이썬 SafeLoader 대비 수배 빠름)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+@lru_cache(maxsize=8)
+def _read_config(config_path: str, mtime: float) -> Dict:
+    """설정 파일 파싱 (경로+수정 시각 단위 캐시, 파일이 바뀌면 다시 읽음)"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
 
 class AWSDataCollector:
     """
@@ -23,6 +35,24 @@ class AWSDataCollector:
     - 서비스 수집기: boto3를 통한 서비스 메타데이터 수집
     """
     
+    # 카테고리별 출력 파일명 (상태 키 → 파일명)
+    OUTPUT_FILES = {
+        "icons": {
+            "csv": "aws_icons_mapping.csv",
+            "json": "aws_icons_mapping.json"
+        },
+        "products": {
+            "csv": "aws_products.csv",
+            "json": "aws_products.json"
+        },
+        "services": {
+            "csv": "aws_services.csv",
+            "json": "aws_services.json",
+            "resources_csv": "aws_resources.csv",
+            "resources_json": "aws_resources.json"
+        }
+    }
+    
     def __init__(self, config_path: Optional[str] = None):
         """
         초기화
@@ -31,13 +61,52 @@ class AWSDataCollector:
             config_path: 설정 파일 경로 (기본값: config.yaml)
         """
         self.config = self._load_config(config_path)
-        self.icon_collector = AWSIconCollector()
-        self.product_collector = AWSProductCollector()
-        self.service_collector = AWSServiceCollector()
+        
+        # 수집기는 처음 사용할 때 생성 (--icons-only, --status 등에서 boto3 초기화 비용 회피)
+        self._icon_collector = None
+        self._product_collector = None
+        self._service_collector = None
+        
+        # collect_all 병렬 실행 시 여러 줄 통계 출력이 섞이지 않도록 보호
+        self._print_lock = threading.Lock()
+        
+        # 카테고리별 출력 디렉터리/파일 경로는 한 번만 계산 (상태 폴링 시 재계산 방지)
+        self.output_dirs = {
+            category: self.config["collectors"][category]["output_dir"]
+            for category in self.OUTPUT_FILES
+        }
+        self.output_paths = {
+            category: {key: os.path.join(self.output_dirs[category], name) for key, name in files.items()}
+            for category, files in self.OUTPUT_FILES.items()
+        }
         
         # 출력 디렉터리 생성
         self._create_output_dirs()
     
+    @property
+    def icon_collector(self):
+        """아이콘 수집기 (지연 생성)"""
+        if self._icon_collector is None:
+            from collectors.icon_collector import AWSIconCollector
+            self._icon_collector = AWSIconCollector()
+        return self._icon_collector
+    
+    @property
+    def product_collector(self):
+        """제품 수집기 (지연 생성)"""
+        if self._product_collector is None:
+            from collectors.product_collector import AWSProductCollector
+            self._product_collector = AWSProductCollector()
+        return self._product_collector
+    
+    @property
+    def service_collector(self):
+        """서비스 수집기 (지연 생성, import 시점에 boto3 로드)"""
+        if self._service_collector is None:
+            from collectors.service_collector import AWSServiceCollector
+            self._service_collector = AWSServiceCollector()
+        return self._service_collector
+    
     def _load_config(self, config_path: Optional[str]) -> Dict:
         """설정 파일 로드"""
         if config_path is None:
@@ -48,8 +117,8 @@ class AWSDataCollector:
             return self._get_default_config()
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            # 캐시된 원본이 변경되지 않도록 복사본 반환
+            config = copy.deepcopy(_read_config(config_path, os.path.getmtime(config_path)))
             print(f"✅ 설정 파일 로드: {config_path}")
             return config
         except Exception as e:
@@ -81,13 +150,14 @@ class AWSDataCollector:
     def _create_output_dirs(self):
         """출력 디렉터리 생성"""
         dirs = [
-            self.config["collectors"]["icons"]["output_dir"],
-            self.config["collectors"]["products"]["output_dir"],
-            self.config["collectors"]["services"]["output_dir"],
+            *self.output_dirs.values(),
             self.config["exporters"]["unified_output"]
         ]
         
+        # 이미 있는 디렉터리는 건너뛰어 상태 확인(--status) 등에서 불필요한 syscall/출력 방지
         for dir_path in dirs:
+            if os.path.isdir(dir_path):
+                continue
             Path(dir_path).mkdir(parents=True, exist_ok=True)
             print(f"📁 디렉터리 생성: {dir_path}")
     
@@ -102,7 +172,6 @@ class AWSDataCollector:
             print("\n🎨 AWS 아이콘 수집 시작...")
             
             zip_path = self.config["collectors"]["icons"]["zip_path"]
-            output_dir = self.config["collectors"]["icons"]["output_dir"]
             
             if not os.path.exists(zip_path):
                 print(f"❌ 아이콘 ZIP 파일이 없습니다: {zip_path}")
@@ -116,17 +185,16 @@ class AWSDataCollector:
                 return False
             
             # 파일 저장
-            csv_path = os.path.join(output_dir, "aws_icons_mapping.csv")
-            json_path = os.path.join(output_dir, "aws_icons_mapping.json")
-            
-            self.icon_collector.save_mappings(mappings, csv_path, json_path)
+            paths = self.output_paths["icons"]
+            self.icon_collector.save_mappings(mappings, paths["csv"], paths["json"])
             
             # 통계 출력
             stats = self.icon_collector.get_statistics(mappings)
-            print(f"📊 아이콘 통계:")
-            print(f"   - 총 아이콘: {stats['total_icons']}개")
-            print(f"   - 그룹 수: {len(stats['groups'])}개")
-            print(f"   - 서비스 수: {len(stats['services'])}개")
+            with self._print_lock:
+                print(f"📊 아이콘 통계:")
+                print(f"   - 총 아이콘: {stats['total_icons']}개")
+                print(f"   - 그룹 수: {len(stats['groups'])}개")
+                print(f"   - 서비스 수: {len(stats['services'])}개")
             
             return True
             
@@ -144,8 +212,6 @@ class AWSDataCollector:
         try:
             print("\n🛍️ AWS 제품 정보 수집 시작...")
             
-            output_dir = self.config["collectors"]["products"]["output_dir"]
-            
             # 제품 정보 수집
             products = self.product_collector.collect_products()
             
@@ -154,17 +220,16 @@ class AWSDataCollector:
                 return False
             
             # 파일 저장
-            csv_path = os.path.join(output_dir, "aws_products.csv")
-            json_path = os.path.join(output_dir, "aws_products.json")
-            
-            self.product_collector.save_products(products, csv_path, json_path)
+            paths = self.output_paths["products"]
+            self.product_collector.save_products(products, paths["csv"], paths["json"])
             
             # 통계 출력
             stats = self.product_collector.get_statistics(products)
-            print(f"📊 제품 통계:")
-            print(f"   - 총 제품: {stats['total_products']}개")
-            print(f"   - 그룹 수: {len(stats['groups'])}개")
-            print(f"   - 서비스 수: {len(stats['services'])}개")
+            with self._print_lock:
+                print(f"📊 제품 통계:")
+                print(f"   - 총 제품: {stats['total_products']}개")
+                print(f"   - 그룹 수: {len(stats['groups'])}개")
+                print(f"   - 서비스 수: {len(stats['services'])}개")
             
             return True
             
@@ -182,8 +247,6 @@ class AWSDataCollector:
         try:
             print("\n🔧 AWS 서비스 정보 수집 시작...")
             
-            output_dir = self.config["collectors"]["services"]["output_dir"]
-            
             # 서비스 정보 수집
             services = self.service_collector.collect_services()
             resources = self.service_collector.infer_resources()
@@ -193,22 +256,19 @@ class AWSDataCollector:
                 return False
             
             # 파일 저장
-            services_csv = os.path.join(output_dir, "aws_services.csv")
-            services_json = os.path.join(output_dir, "aws_services.json")
-            resources_csv = os.path.join(output_dir, "aws_resources.csv")
-            resources_json = os.path.join(output_dir, "aws_resources.json")
-            
-            self.service_collector.save_services(services, services_csv, services_json)
-            self.service_collector.save_resources(resources, resources_csv, resources_json)
+            paths = self.output_paths["services"]
+            self.service_collector.save_services(services, paths["csv"], paths["json"])
+            self.service_collector.save_resources(resources, paths["resources_csv"], paths["resources_json"])
             
             # 통계 출력
             stats = self.service_collector.get_statistics(services, resources)
-            print(f"📊 서비스 통계:")
-            print(f"   - 총 서비스: {stats['total_services']}개")
-            print(f"   - 리소스 추론: {stats['total_resources']}개")
-            print(f"   - 글로벌 서비스: {stats['global_services']}개")
-            print(f"   - 리소스 인터페이스: {stats['resource_services']}개")
-            print(f"   - 평균 리전 수: {stats['avg_regions']:.1f}")
+            with self._print_lock:
+                print(f"📊 서비스 통계:")
+                print(f"   - 총 서비스: {stats['total_services']}개")
+                print(f"   - 리소스 추론: {stats['total_resources']}개")
+                print(f"   - 글로벌 서비스: {stats['global_services']}개")
+                print(f"   - 리소스 인터페이스: {stats['resource_services']}개")
+                print(f"   - 평균 리전 수: {stats['avg_regions']:.1f}")
             
             return True
             
@@ -225,20 +285,25 @@ class AWSDataCollector:
         """
         print("🚀 AWS 데이터 수집 시작...")
         
-        success_count = 0
-        total_count = 3
-        
-        # 아이콘 수집
-        if self.collect_icons():
-            success_count += 1
+        # 세 수집기는 서로 독립적이고 대부분 I/O 대기(ZIP 읽기, HTTP, boto3)이므로
+        # 스레드로 동시에 실행 (총 소요 시간 = 가장 느린 수집기)
+        tasks = {
+            "icons": self.collect_icons,
+            "products": self.collect_products,
+            "services": self.collect_services,
+        }
         
-        # 제품 정보 수집
-        if self.collect_products():
-            success_count += 1
+        success_count = 0
+        total_count = len(tasks)
         
-        # 서비스 정보 수집
-        if self.collect_services():
-            success_count += 1
+        with ThreadPoolExecutor(max_workers=total_count) as executor:
+            futures = {executor.submit(fn): name for name, fn in tasks.items()}
+            for future in as_completed(futures):
+                try:
+                    if future.result():
+                        success_count += 1
+                except Exception as e:
+                    print(f"❌ {futures[future]} 수집 실패: {e}")
         
         print(f"\n🎉 수집 완료: {success_count}/{total_count} 성공")
         
@@ -250,24 +315,21 @@ class AWSDataCollector:
             return False
     
     def get_collection_status(self) -> Dict:
-        """수집 상태 확인"""
-        status = {
-            "icons": {
-                "csv": os.path.exists(os.path.join(self.config["collectors"]["icons"]["output_dir"], "aws_icons_mapping.csv")),
-                "json": os.path.exists(os.path.join(self.config["collectors"]["icons"]["output_dir"], "aws_icons_mapping.json"))
-            },
-            "products": {
-                "csv": os.path.exists(os.path.join(self.config["collectors"]["products"]["output_dir"], "aws_products.csv")),
-                "json": os.path.exists(os.path.join(self.config["collectors"]["products"]["output_dir"], "aws_products.json"))
-            },
-            "services": {
-                "csv": os.path.exists(os.path.join(self.config["collectors"]["services"]["output_dir"], "aws_services.csv")),
-                "json": os.path.exists(os.path.join(self.config["collectors"]["services"]["output_dir"], "aws_services.json")),
-                "resources_csv": os.path.exists(os.path.join(self.config["collectors"]["services"]["output_dir"], "aws_resources.csv")),
-                "resources_json": os.path.exists(os.path.join(self.config["collectors"]["services"]["output_dir"], "aws_resources.json"))
-            }
-        }
+        """수집 상태 확인 (카테고리별 출력 디렉터리를 한 번씩만 읽음)"""
+        status = {}
+        for category, files in self.OUTPUT_FILES.items():
+            present = self._dir_files(self.output_dirs[category])
+            status[category] = {key: name in present for key, name in files.items()}
         return status
+    
+    @staticmethod
+    def _dir_files(dir_path: str) -> Set[str]:
+        """디렉터리의 파일명 집합 (없으면 빈 집합)"""
+        try:
+            with os.scandir(dir_path) as it:
+                return {entry.name for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
 
 
 def main():
@@ -4,32 +4,46 @@ LLM Vision API를 사용하여 AWS 다이어그램에서 서비스 아이콘을
 """
 
 import os
+import asyncio
 import json
+import re
 import yaml
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 from PIL import Image
 import numpy as np
 from tqdm import tqdm
 
-from llm_providers import LLMProvider, OpenAIProvider, DeepSeekProvider
+from llm_providers import LLMProvider, OpenAIProvider, DeepSeekProvider, DEFAULT_MAX_EDGE, scaled_size, encode_jpeg
 from prompts import PromptManager
 from utils.io_utils import load_image, save_json, list_images
 from utils.proposals import propose_regions
 from utils.taxonomy import Taxonomy
+from utils.llm_cache import LLMCache
 from utils.exporters import to_labelstudio, to_yolo, to_coco
 
-@dataclass
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # 선택적 의존성: 없으면 표준 json 사용
+    _json_loads = json.loads
+
+# 응답 본문에서 첫 여는 괄호부터 마지막 닫는 괄호까지의 JSON 블록
+_JSON_RE = re.compile(r"(\{.*\}|\[.*\])", re.DOTALL)
+
+@dataclass(slots=True, frozen=True)
 class DetectionResult:
-    """감지 결과 데이터 클래스"""
-    bbox: List[int]  # [x, y, w, h]
+    """감지 결과 데이터 클래스 (감지마다 생성되므로 slots, 불변)"""
+    bbox: Tuple[int, int, int, int]  # (x, y, w, h)
     label: str
     confidence: float
     service_code: str = ""
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """분석 결과 데이터 클래스"""
     image_path: str
@@ -65,6 +79,22 @@ class AWSLLMAutoLabeler:
         self.llm_provider = self._setup_llm_provider()
         self.prompt_manager = PromptManager()
         
+        # 동시에 진행할 LLM 호출 수 상한 (API 대기 시간이 대부분이므로 겹쳐서 처리)
+        self.concurrency = int(self.config["runtime"].get("concurrency", 8))
+        
+        # 전체 이미지 분석 시 LLM에 보낼 긴 변 최대 크기 (패치는 원본 크기로 전송)
+        self.max_edge = int(self.config["runtime"].get("max_edge", DEFAULT_MAX_EDGE))
+        
+        # 패치 후보 NMS IoU 임계값 (겹치는 후보만큼 LLM 호출이 늘어나므로 제거)
+        self.nms_iou = float(self.config["runtime"].get("nms_iou", 0.4))
+        
+        # 한 번의 LLM 호출에 묶어 보낼 패치 수 (1이면 패치마다 개별 호출)
+        self.patch_batch = max(1, int(self.config["runtime"].get("patch_batch", 16)))
+        
+        # 로드 시 긴 변 최대 크기 (JPEG는 축소 디코딩, 결과 좌표는 원본 크기로 환산)
+        # None/0이면 원본 크기로 로드
+        self.load_max_edge = int(self.config["runtime"].get("load_max_edge", 2048) or 0) or None
+        
         print(f"✅ LLM 오토라벨러 초기화 완료")
         print(f"   - 제공자: {self.config['provider']}")
         print(f"   - 모드: {self.config['mode']}")
@@ -92,7 +122,20 @@ class AWSLLMAutoLabeler:
         return Taxonomy.from_csv(str(taxonomy_path))
     
     def _setup_llm_provider(self) -> LLMProvider:
-        """LLM 제공자 설정"""
+        """LLM 제공자 설정 (runtime.cache_dir가 있으면 응답 캐시 연결)"""
+        provider = self._create_llm_provider()
+        
+        cache_dir = self.config["runtime"].get("cache_dir", "./.cache/llm")
+        if cache_dir:
+            cache_path = Path(cache_dir)
+            if not cache_path.is_absolute():
+                cache_path = Path(__file__).parent.parent / cache_path
+            provider.cache = LLMCache(str(cache_path))
+        
+        return provider
+    
+    def _create_llm_provider(self) -> LLMProvider:
+        """LLM 제공자 생성"""
         provider_name = self.config["provider"]
         
         if provider_name == "openai":
@@ -110,28 +153,33 @@ class AWSLLMAutoLabeler:
         else:
             raise ValueError(f"지원하지 않는 제공자: {provider_name}")
     
-    def _safe_json_parse(self, response: str) -> Dict[str, Any]:
+    def _safe_json_parse(self, response: Union[str, bytes, None]) -> Dict[str, Any]:
         """안전한 JSON 파싱"""
+        if not response:
+            return {"objects": []}
+        
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
+            return _json_loads(response)
+        except ValueError:
             pass
         
-        # 괄호 추출 시도
-        for bracket in ["{", "["]:
-            start = response.find(bracket)
-            if start >= 0:
-                try:
-                    return json.loads(response[start:])
-                except json.JSONDecodeError:
-                    continue
+        # 앞뒤 설명문을 제외한 JSON 블록만 추출해 재시도
+        if isinstance(response, bytes):
+            response = response.decode("utf-8", errors="replace")
+        match = _JSON_RE.search(response)
+        if match:
+            try:
+                return _json_loads(match.group(1))
+            except ValueError:
+                pass
         
         # 최후의 수단
         return {"objects": []}
     
     def _normalize_detection(self, detection: Dict[str, Any], 
-                           image_width: int, image_height: int) -> Optional[DetectionResult]:
-        """감지 결과 정규화"""
+                           image_width: int, image_height: int,
+                           scale: Tuple[float, float] = (1.0, 1.0)) -> Optional[DetectionResult]:
+        """감지 결과 정규화 (scale: 축소 전송한 이미지 좌표 → 원본 좌표 배율)"""
         name = str(detection.get("name", "")).strip()
         bbox = detection.get("bbox", [0, 0, 0, 0])
         confidence = float(detection.get("confidence", 0.0))
@@ -143,8 +191,10 @@ class AWSLLMAutoLabeler:
         # 택소노미 정규화
         canonical_name, taxonomy_score = self.taxonomy.normalize(name)
         
-        # 바운딩 박스 정규화
+        # 바운딩 박스 정규화 (축소 전송한 경우 원본 좌표로 환산)
         x, y, w, h = bbox
+        sx, sy = scale
+        x, y, w, h = float(x) * sx, float(y) * sy, float(w) * sx, float(h) * sy
         x = max(0, min(int(x), image_width))
         y = max(0, min(int(y), image_height))
         w = max(1, min(int(w), image_width - x))
@@ -154,7 +204,7 @@ class AWSLLMAutoLabeler:
         final_confidence = min(confidence, taxonomy_score)
         
         return DetectionResult(
-            bbox=[x, y, w, h],
+            bbox=(x, y, w, h),
             label=canonical_name,
             confidence=round(final_confidence, 4),
             service_code=canonical_name
@@ -167,20 +217,57 @@ class AWSLLMAutoLabeler:
         Args:
             image_path: 분석할 이미지 경로
             
+        Returns:
+            AnalysisResult: 분석 결과
+        """
+        async def _run():
+            sem = asyncio.Semaphore(self.concurrency)
+            return await self._analyze_image_async(image_path, sem)
+        
+        return asyncio.run(self._run_async(_run()))
+    
+    async def _run_async(self, coro):
+        """
+        이벤트 루프 공통 실행 환경
+        
+        동기 전용 제공자 호출과 이미지 로드/후보 제안은 asyncio.to_thread로 실행되므로,
+        기본 실행기를 동시 호출 수에 맞춘 스레드 풀로 교체합니다
+        (기본 풀은 CPU 수 기준이라 LLM 대기와 이미지 처리가 함께 밀릴 수 있음).
+        """
+        executor = ThreadPoolExecutor(max_workers=self.concurrency * 2, thread_name_prefix="llm")
+        asyncio.get_running_loop().set_default_executor(executor)
+        try:
+            return await coro
+        finally:
+            await self.llm_provider.aclose()
+    
+    async def _analyze_image_async(self, image_path: str, sem: asyncio.Semaphore) -> AnalysisResult:
+        """
+        단일 이미지 분석 (비동기)
+        
+        Args:
+            image_path: 분석할 이미지 경로
+            sem: LLM 동시 호출 수를 제한하는 세마포어
+            
         Returns:
             AnalysisResult: 분석 결과
         """
         start_time = time.time()
         
-        # 이미지 로드
-        image = load_image(image_path)
-        width, height = image.size
+        # 이미지 로드 (큰 이미지는 축소 로드)
+        image = await asyncio.to_thread(load_image, image_path, self.load_max_edge)
+        width, height = image.info.get("original_size", image.size)
         
         # 모드에 따른 분석
         if self.config["mode"] == "full_image_llm":
-            detections = self._analyze_full_image(image)
+            detections = await self._analyze_full_image(image, sem)
         else:  # patch_llm
-            detections = self._analyze_patch_llm(image)
+            detections = await self._analyze_patch_llm(image, sem)
+        
+        # 축소 로드한 경우 원본 이미지 좌표로 환산
+        if (width, height) != image.size:
+            detections = self._rescale_detections(detections, width / image.width, height / image.height,
+                                                  width, height)
         
         processing_time = time.time() - start_time
         
@@ -192,82 +279,165 @@ class AWSLLMAutoLabeler:
             processing_time=processing_time
         )
     
-    def _analyze_full_image(self, image: Image.Image) -> List[DetectionResult]:
+    @staticmethod
+    def _rescale_detections(detections: List[DetectionResult], sx: float, sy: float,
+                            width: int, height: int) -> List[DetectionResult]:
+        """감지 박스를 배율만큼 환산 (원본 이미지 범위로 제한)"""
+        rescaled = []
+        for detection in detections:
+            x, y, w, h = detection.bbox
+            x = min(int(round(x * sx)), width)
+            y = min(int(round(y * sy)), height)
+            w = max(1, min(int(round(w * sx)), width - x))
+            h = max(1, min(int(round(h * sy)), height - y))
+            rescaled.append(replace(detection, bbox=(x, y, w, h)))
+        return rescaled
+    
+    async def _analyze_full_image(self, image: Image.Image, sem: asyncio.Semaphore) -> List[DetectionResult]:
         """전체 이미지 LLM 분석"""
         prompt = self.prompt_manager.get_full_image_prompt()
-        response = self.llm_provider.analyze_image(image, prompt)
+        async with sem:
+            response = await self.llm_provider.analyze_image_async(image, prompt, self.max_edge)
         data = self._safe_json_parse(response)
         
+        # LLM이 본 (축소된) 이미지 좌표를 원본 좌표로 되돌릴 배율
+        sent_w, sent_h = scaled_size(image.size, self.max_edge)
+        scale = (image.width / sent_w, image.height / sent_h)
+        
         detections = []
         for obj in data.get("objects", []):
-            detection = self._normalize_detection(obj, image.width, image.height)
+            detection = self._normalize_detection(obj, image.width, image.height, scale)
             if detection:
                 detections.append(detection)
         
         return detections
     
-    def _analyze_patch_llm(self, image: Image.Image) -> List[DetectionResult]:
-        """패치별 LLM 분석"""
-        import cv2
-        
-        # 이미지를 OpenCV 형식으로 변환
-        img_array = np.array(image)
-        img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-        
-        # 객체 제안
-        boxes = propose_regions(img_bgr)
+    async def _analyze_patch_llm(self, image: Image.Image, sem: asyncio.Semaphore) -> List[DetectionResult]:
+        """
+        패치별 LLM 분석
         
-        detections = []
-        prompt = self.prompt_manager.get_patch_prompt()
+        패치를 patch_batch개씩 묶어 한 번의 요청으로 보내고,
+        묶음 호출들은 세마포어 한도 안에서 동시에 실행합니다.
+        """
+        boxes = (await asyncio.to_thread(self._propose_boxes, image)).tolist()
         
-        for x, y, w, h in boxes:
-            # 이미지 크롭
-            crop = image.crop((x, y, x + w, y + h))
-            
-            # LLM 분석
-            response = self.llm_provider.analyze_image(crop, prompt)
-            data = self._safe_json_parse(response)
+        if self.patch_batch == 1:
+            prompt = self.prompt_manager.get_patch_prompt()
             
-            # 후보들 중 최고 점수 선택
-            candidates = data.get("candidates", [])
-            best_label, best_score = None, 0.0
+            async def analyze_patch(box: List[int]) -> List[Optional[DetectionResult]]:
+                # 크롭 + JPEG 인코딩은 한 번만 (이벤트 루프 밖에서, 재시도 시에도 같은 바이트 재사용)
+                crop_bytes = (await asyncio.to_thread(self._encode_crops, image, [box]))[0]
+                
+                # LLM 분석 (패치는 이미 작으므로 축소하지 않음)
+                async with sem:
+                    response = await self.llm_provider.analyze_image_async(crop_bytes, prompt, None)
+                return [self._candidates_detection(self._safe_json_parse(response).get("candidates", []), box)]
             
-            for candidate in candidates:
-                canonical_name, score = self.taxonomy.normalize(str(candidate))
-                if score > best_score:
-                    best_label, best_score = canonical_name, score
+            tasks = [analyze_patch(box) for box in boxes]
+        else:
+            async def analyze_group(group: List[List[int]]) -> List[Optional[DetectionResult]]:
+                crops = await asyncio.to_thread(self._encode_crops, image, group)
+                prompt = self.prompt_manager.get_patch_batch_prompt(len(group))
+                
+                async with sem:
+                    response = await self.llm_provider.analyze_images_async(crops, prompt, None)
+                return self._patch_batch_detections(response, group)
             
-            # 임계값 체크
-            if best_label and best_score >= 0.5:
-                detection = DetectionResult(
-                    bbox=[x, y, w, h],
-                    label=best_label,
-                    confidence=round(best_score, 3),
-                    service_code=best_label
-                )
-                detections.append(detection)
+            step = self.patch_batch
+            tasks = [analyze_group(boxes[i:i + step]) for i in range(0, len(boxes), step)]
         
-        return detections
+        # 제안 순서대로 결과 유지
+        results = await asyncio.gather(*tasks)
+        return [detection for group in results for detection in group if detection]
+    
+    @staticmethod
+    def _encode_crops(image: Image.Image, boxes: List[List[int]]) -> List[bytes]:
+        """후보 영역을 잘라 JPEG 바이트로 인코딩"""
+        return [encode_jpeg(image.crop((x, y, x + w, y + h))) for x, y, w, h in boxes]
+    
+    def _propose_boxes(self, image: Image.Image) -> np.ndarray:
+        """객체 후보 영역 제안 ((N,4) [x,y,w,h] 배열)"""
+        import cv2
+        
+        # 후보 제안(Canny)은 그레이만 사용하므로 RGB→GRAY 한 번만 변환 (BGR 중간 복사본 없음)
+        gray = cv2.cvtColor(np.asarray(image), cv2.COLOR_RGB2GRAY)
+        
+        # 객체 제안
+        return propose_regions(gray, self.nms_iou)
+    
+    def _patch_batch_detections(self, response: str,
+                                boxes: List[List[int]]) -> List[Optional[DetectionResult]]:
+        """일괄 패치 응답({"patches": [{"index", "candidates"}]})을 패치별 감지 결과로 변환"""
+        data = self._safe_json_parse(response)
+        entries = data.get("patches", []) if isinstance(data, dict) else []
+        
+        # index가 없으면 응답 내 순서를 사용
+        candidates_by_index = {}
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                index = int(entry.get("index", position))
+            except (TypeError, ValueError):
+                continue
+            candidates_by_index.setdefault(index, entry.get("candidates", []))
+        
+        return [self._candidates_detection(candidates_by_index.get(i, []), box) for i, box in enumerate(boxes)]
+    
+    def _candidates_detection(self, candidates: List[Any], box: List[int]) -> Optional[DetectionResult]:
+        """패치 후보 이름들 중 최고 점수 후보를 감지 결과로 변환"""
+        # 후보들 중 최고 점수 선택
+        best_label, best_score = None, 0.0
+        
+        for canonical_name, score in self.taxonomy.normalize_batch([str(c) for c in candidates]):
+            if score > best_score:
+                best_label, best_score = canonical_name, score
+        
+        # 임계값 체크
+        if best_label and best_score >= 0.5:
+            x, y, w, h = box
+            return DetectionResult(
+                bbox=(x, y, w, h),
+                label=best_label,
+                confidence=round(best_score, 3),
+                service_code=best_label
+            )
+        return None
     
     def analyze_batch(self, image_paths: List[str]) -> List[AnalysisResult]:
         """
         배치 이미지 분석
         
+        이미지와 패치 단위 LLM 호출을 비동기로 겹쳐 실행하며,
+        동시 호출 수는 runtime.concurrency로 제한합니다.
+        
         Args:
             image_paths: 분석할 이미지 경로 리스트
             
         Returns:
-            List[AnalysisResult]: 분석 결과 리스트
+            List[AnalysisResult]: 분석 결과 리스트 (입력 순서 유지)
         """
-        results = []
+        async def _run():
+            sem = asyncio.Semaphore(self.concurrency)
+            # 한꺼번에 모든 이미지를 메모리에 올리지 않도록 진행 중인 이미지 수도 제한
+            image_sem = asyncio.Semaphore(self.concurrency)
+            
+            with tqdm(total=len(image_paths), desc="LLM 분석") as pbar:
+                async def one(image_path: str) -> AnalysisResult:
+                    async with image_sem:
+                        try:
+                            return await self._analyze_image_async(image_path, sem)
+                        finally:
+                            pbar.update(1)
+                
+                return await asyncio.gather(*(one(p) for p in image_paths), return_exceptions=True)
         
-        for image_path in tqdm(image_paths, desc="LLM 분석"):
-            try:
-                result = self.analyze_image(image_path)
-                results.append(result)
-            except Exception as e:
-                print(f"⚠️ 이미지 분석 실패: {image_path} - {e}")
+        results = []
+        for image_path, outcome in zip(image_paths, asyncio.run(self._run_async(_run()))):
+            if isinstance(outcome, Exception):
+                print(f"⚠️ 이미지 분석 실패: {image_path} - {outcome}")
                 continue
+            results.append(outcome)
         
         return results
     
@@ -322,17 +492,25 @@ class AWSLLMAutoLabeler:
         return output_path
     
     def get_statistics(self, results: List[AnalysisResult]) -> Dict[str, Any]:
-        """분석 결과 통계"""
+        """분석 결과 통계 (감지 결과를 한 번만 순회)"""
+        detections = [detection for r in results for detection in r.detections]
+        
+        # 신뢰도 분포는 배열 비교로 한 번에 집계
+        confs = np.fromiter((d.confidence for d in detections), dtype=np.float64, count=len(detections))
+        high = int(np.count_nonzero(confs >= 0.8))
+        low = int(np.count_nonzero(confs < 0.5))
+        
         stats = {
             "total_images": len(results),
-            "total_detections": sum(len(r.detections) for r in results),
+            "total_detections": len(detections),
             "avg_detections_per_image": 0,
             "avg_processing_time": 0,
-            "service_distribution": {},
+            # 서비스별 분포
+            "service_distribution": dict(Counter(d.label for d in detections)),
             "confidence_distribution": {
-                "high": 0,    # >= 0.8
-                "medium": 0,  # 0.5-0.8
-                "low": 0      # < 0.5
+                "high": high,                          # >= 0.8
+                "medium": len(detections) - high - low,  # 0.5-0.8
+                "low": low                             # < 0.5
             }
         }
         
@@ -340,18 +518,4 @@ class AWSLLMAutoLabeler:
             stats["avg_detections_per_image"] = stats["total_detections"] / len(results)
             stats["avg_processing_time"] = sum(r.processing_time for r in results) / len(results)
         
-        # 서비스별 분포
-        for result in results:
-            for detection in result.detections:
-                service = detection.label
-                stats["service_distribution"][service] = stats["service_distribution"].get(service, 0) + 1
-                
-                # 신뢰도 분포
-                if detection.confidence >= 0.8:
-                    stats["confidence_distribution"]["high"] += 1
-                elif detection.confidence >= 0.5:
-                    stats["confidence_distribution"]["medium"] += 1
-                else:
-                    stats["confidence_distribution"]["low"] += 1
-        
         return stats
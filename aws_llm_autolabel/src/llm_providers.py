@@ -4,15 +4,147 @@ OpenAI와 DeepSeek Vision API를 추상화하여 일관된 인터페이스를 
 """
 
 import os
+import asyncio
 import base64
 import io
 import json
+import math
 import time
+import functools
+import inspect
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 from PIL import Image
+import aiohttp
 import requests
 import openai
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.llm_cache import LLMCache
+
+# 전체 이미지 전송 시 긴 변 최대 픽셀 (업로드 크기/비전 토큰 절감)
+DEFAULT_MAX_EDGE = 1024
+
+def scaled_size(size: Tuple[int, int], max_edge: Optional[int]) -> Tuple[int, int]:
+    """긴 변이 max_edge를 넘지 않도록 축소한 크기 (max_edge가 없거나 이미 작으면 원본 크기)"""
+    w, h = size
+    if not max_edge:
+        return w, h
+    scale = max_edge / max(w, h)
+    if scale >= 1:
+        return w, h
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+# 제공자에 넘길 수 있는 이미지: PIL 이미지 또는 이미 JPEG로 인코딩된 바이트
+ImageInput = Union[Image.Image, bytes]
+
+def encode_jpeg(image: Image.Image, max_edge: Optional[int] = None) -> bytes:
+    """JPEG 인코딩 (긴 변이 max_edge보다 크면 축소 후 인코딩)"""
+    size = scaled_size(image.size, max_edge)
+    if size != image.size:
+        image = image.resize(size, Image.LANCZOS)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=85, optimize=True)
+    return buf.getvalue()
+
+class JsonBlockScanner:
+    """스트리밍 텍스트에서 첫 번째 유효한 최상위 JSON 블록({...} 또는 [...])이 완성되는 시점 감지"""
+    
+    __slots__ = ("text", "pos", "start", "depth", "in_string", "escape")
+    
+    def __init__(self):
+        self.text = ""
+        self.pos = 0        # 다음에 검사할 위치
+        self.start = -1     # 현재 최상위 블록 시작 위치
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+    
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        텍스트 조각을 추가
+        
+        Returns:
+            Optional[str]: 파싱 가능한 JSON 블록이 완성되면 그 블록, 아니면 None
+        """
+        self.text += chunk
+        text = self.text
+        for i in range(self.pos, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch in "{[":
+                if self.depth == 0:
+                    self.start = i
+                self.depth += 1
+            elif self.depth == 0:
+                # 블록 밖 설명문의 따옴표 등은 무시
+                continue
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    block = text[self.start:i + 1]
+                    try:
+                        json.loads(block)
+                    except ValueError:
+                        # 설명문 속 괄호({json} 등)였으면 다음 블록 탐색
+                        continue
+                    self.pos = i + 1
+                    return block
+        self.pos = len(text)
+        return None
+
+# API 호출 실패 시 반환하는 빈 응답 (캐시에는 저장하지 않음)
+EMPTY_RESPONSE = '{"objects": []}'
+
+def _cached(fn):
+    """provider.cache가 설정되어 있으면 같은 이미지/프롬프트/모델 응답을 재사용"""
+    default_edge = inspect.signature(fn).parameters["max_edge"].default
+    
+    @functools.wraps(fn)
+    def wrapper(self, image, prompt, max_edge=default_edge):
+        if self.cache is None:
+            return fn(self, image, prompt, max_edge)
+        key = self.cache.key(image, prompt, self.vision_model, max_edge)
+        response = self.cache.get(key)
+        if response is None:
+            response = fn(self, image, prompt, max_edge)
+            if response != EMPTY_RESPONSE:
+                self.cache.put(key, response)
+        return response
+    return wrapper
+
+def _cached_async(fn):
+    """_cached의 비동기 메서드 버전"""
+    default_edge = inspect.signature(fn).parameters["max_edge"].default
+    
+    def lookup(cache, image, prompt, model, max_edge):
+        key = cache.key(image, prompt, model, max_edge)
+        return key, cache.get(key)
+    
+    @functools.wraps(fn)
+    async def wrapper(self, image, prompt, max_edge=default_edge):
+        if self.cache is None:
+            return await fn(self, image, prompt, max_edge)
+        # 픽셀 해시와 캐시 파일 읽기/쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+        key, response = await asyncio.to_thread(
+            lookup, self.cache, image, prompt, self.vision_model, max_edge)
+        if response is None:
+            response = await fn(self, image, prompt, max_edge)
+            if response != EMPTY_RESPONSE:
+                await asyncio.to_thread(self.cache.put, key, response)
+        return response
+    return wrapper
 
 class LLMProvider(ABC):
     """LLM 제공자 추상 클래스"""
@@ -21,17 +153,84 @@ class LLMProvider(ABC):
         self.base_url = base_url
         self.api_key = api_key
         self.vision_model = vision_model
+        # 응답 캐시 (None이면 사용 안 함)
+        self.cache: Optional[LLMCache] = None
     
     @abstractmethod
-    def analyze_image(self, image: Image.Image, prompt: str) -> str:
-        """이미지 분석"""
+    def analyze_image(self, image: ImageInput, prompt: str,
+                      max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """
+        이미지 분석
+        
+        Args:
+            image: PIL 이미지 또는 JPEG 바이트 (바이트는 재인코딩 없이 그대로 전송)
+            prompt: 프롬프트
+            max_edge: 전송 전 축소할 긴 변 크기 (None이면 원본, 바이트 입력에는 적용 안 함)
+        """
+        pass
+    
+    async def analyze_image_async(self, image: ImageInput, prompt: str,
+                                  max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """이미지 분석 (비동기, 기본 구현은 동기 호출을 스레드에서 실행)"""
+        return await asyncio.to_thread(self.analyze_image, image, prompt, max_edge)
+    
+    def analyze_images(self, images: List[ImageInput], prompt: str,
+                       max_edge: Optional[int] = None) -> str:
+        """
+        여러 이미지를 한 번의 요청으로 분석
+        
+        기본 구현은 이미지를 행 우선 격자(모자이크) 한 장으로 합쳐 analyze_image를 호출합니다.
+        여러 image_url을 한 메시지에 담을 수 있는 제공자는 재정의합니다.
+        """
+        return self.analyze_image(self._mosaic(images), prompt, max_edge)
+    
+    async def analyze_images_async(self, images: List[ImageInput], prompt: str,
+                                   max_edge: Optional[int] = None) -> str:
+        """여러 이미지를 한 번의 요청으로 분석 (비동기)"""
+        return await asyncio.to_thread(self.analyze_images, images, prompt, max_edge)
+    
+    async def aclose(self):
+        """비동기 클라이언트 정리 (이벤트 루프 종료 전에 호출)"""
         pass
     
-    def _pil_to_b64(self, image: Image.Image) -> str:
-        """PIL 이미지를 base64로 인코딩"""
+    @staticmethod
+    def _mosaic(images: List[ImageInput], tile: int = 96) -> Image.Image:
+        """이미지를 tile 크기 칸의 행 우선 격자 한 장으로 합침"""
+        cols = math.ceil(math.sqrt(len(images)))
+        rows = math.ceil(len(images) / cols)
+        canvas = Image.new("RGB", (cols * tile, rows * tile), "white")
+        for i, image in enumerate(images):
+            if isinstance(image, bytes):
+                image = Image.open(io.BytesIO(image))
+            if max(image.size) > tile:
+                image = image.copy()
+                image.thumbnail((tile, tile), Image.LANCZOS)
+            canvas.paste(image, ((i % cols) * tile, (i // cols) * tile))
+        return canvas
+    
+    def _pil_to_b64(self, image: ImageInput, max_edge: Optional[int] = DEFAULT_MAX_EDGE,
+                    fmt: str = "JPEG") -> str:
+        """PIL 이미지를 base64로 인코딩 (긴 변이 max_edge보다 크면 축소 후 인코딩, 바이트는 그대로 사용)"""
+        if isinstance(image, bytes):
+            return self._bytes_to_b64(image)
+        if fmt == "JPEG":
+            return self._bytes_to_b64(encode_jpeg(image, max_edge))
+        
+        size = scaled_size(image.size, max_edge)
+        if size != image.size:
+            image = image.resize(size, Image.LANCZOS)
         buf = io.BytesIO()
-        image.save(buf, format="PNG")
-        return base64.b64encode(buf.getvalue()).decode("utf-8")
+        image.save(buf, format=fmt)
+        return self._bytes_to_b64(buf.getvalue())
+    
+    @staticmethod
+    def _bytes_to_b64(data: bytes) -> str:
+        """인코딩된 이미지 바이트를 base64 문자열로 변환"""
+        return base64.b64encode(data).decode("utf-8")
+    
+    def _image_data_url(self, image: ImageInput, max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """Vision API용 data URL (JPEG)"""
+        return f"data:image/jpeg;base64,{self._pil_to_b64(image, max_edge)}"
 
 class OpenAIProvider(LLMProvider):
     """OpenAI Vision API 제공자"""
@@ -39,51 +238,148 @@ class OpenAIProvider(LLMProvider):
     def __init__(self, base_url: str, api_key: str, vision_model: str):
         super().__init__(base_url, api_key, vision_model)
         self.client = openai.OpenAI(base_url=base_url, api_key=api_key)
+        # 비동기 클라이언트는 이벤트 루프에 묶이므로 루프 안에서 지연 생성
+        self._async_client: Optional[openai.AsyncOpenAI] = None
     
-    def analyze_image(self, image: Image.Image, prompt: str) -> str:
+    def _build_messages(self, images: List[ImageInput], prompt: str, max_edge: Optional[int]) -> list:
+        """Vision 요청 메시지 구성 (이미지 여러 장은 순서대로 image_url 항목으로 추가)"""
+        return [
+            {
+                "role": "system",
+                "content": "You are a precise vision annotator. Return strictly valid JSON."
+            },
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": prompt},
+                    *(
+                        {
+                            "type": "image_url",
+                            "image_url": {"url": self._image_data_url(image, max_edge), "detail": "low"}
+                        }
+                        for image in images
+                    )
+                ]
+            }
+        ]
+    
+    @_cached
+    def analyze_image(self, image: ImageInput, prompt: str,
+                      max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
         """OpenAI Vision API로 이미지 분석"""
-        b64_image = self._pil_to_b64(image)
+        return self._complete(self._build_messages([image], prompt, max_edge))
+    
+    @_cached
+    def analyze_images(self, images: List[ImageInput], prompt: str,
+                       max_edge: Optional[int] = None) -> str:
+        """OpenAI Vision API로 여러 이미지를 한 번에 분석"""
+        return self._complete(self._build_messages(images, prompt, max_edge))
+    
+    def _complete(self, messages: list) -> str:
+        """Chat Completions 호출 (스트리밍, 첫 JSON 블록이 닫히면 즉시 중단)"""
+        try:
+            stream = self.client.chat.completions.create(
+                model=self.vision_model,
+                messages=messages,
+                temperature=0,
+                timeout=120,
+                stream=True
+            )
+            scanner = JsonBlockScanner()
+            try:
+                for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text and (block := scanner.feed(text)) is not None:
+                        return block
+            finally:
+                # 블록 이후 토큰(설명문 등)은 받지 않고 연결 종료
+                stream.close()
+            return scanner.text
+        except Exception as e:
+            print(f"⚠️ OpenAI API 호출 실패: {e}")
+            return EMPTY_RESPONSE
+    
+    @_cached_async
+    async def analyze_image_async(self, image: ImageInput, prompt: str,
+                                  max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """OpenAI Vision API로 이미지 분석 (비동기)"""
+        # 리사이즈/JPEG 인코딩/base64는 이벤트 루프 밖에서 수행 (Pillow는 GIL 해제)
+        messages = await asyncio.to_thread(self._build_messages, [image], prompt, max_edge)
+        return await self._complete_async(messages)
+    
+    @_cached_async
+    async def analyze_images_async(self, images: List[ImageInput], prompt: str,
+                                   max_edge: Optional[int] = None) -> str:
+        """OpenAI Vision API로 여러 이미지를 한 번에 분석 (비동기)"""
+        messages = await asyncio.to_thread(self._build_messages, images, prompt, max_edge)
+        return await self._complete_async(messages)
+    
+    async def _complete_async(self, messages: list) -> str:
+        """Chat Completions 호출 (비동기)"""
+        if self._async_client is None:
+            self._async_client = openai.AsyncOpenAI(base_url=self.base_url, api_key=self.api_key)
         
         try:
-            response = self.client.chat.completions.create(
+            stream = await self._async_client.chat.completions.create(
                 model=self.vision_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a precise vision annotator. Return strictly valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{b64_image}"}
-                            }
-                        ]
-                    }
-                ],
+                messages=messages,
                 temperature=0,
-                timeout=120
+                timeout=120,
+                stream=True
             )
-            return response.choices[0].message.content
+            scanner = JsonBlockScanner()
+            try:
+                async for chunk in stream:
+                    text = chunk.choices[0].delta.content if chunk.choices else None
+                    if text and (block := scanner.feed(text)) is not None:
+                        return block
+            finally:
+                # 블록 이후 토큰(설명문 등)은 받지 않고 연결 종료
+                await stream.close()
+            return scanner.text
         except Exception as e:
             print(f"⚠️ OpenAI API 호출 실패: {e}")
-            return '{"objects": []}'
+            return EMPTY_RESPONSE
+    
+    async def aclose(self):
+        """비동기 클라이언트 정리"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
 class DeepSeekProvider(LLMProvider):
     """DeepSeek Vision API 제공자"""
     
-    def analyze_image(self, image: Image.Image, prompt: str) -> str:
-        """DeepSeek Vision API로 이미지 분석"""
-        b64_image = self._pil_to_b64(image)
-        
-        headers = {
+    def __init__(self, base_url: str, api_key: str, vision_model: str):
+        super().__init__(base_url, api_key, vision_model)
+        # 동기 호출용 세션: 연결(TCP/TLS) 재사용 + 429/5xx 재시도(지수 백오프)
+        self._session = requests.Session()
+        self._session.headers.update(self._headers())
+        adapter = HTTPAdapter(
+            pool_connections=64,
+            pool_maxsize=64,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(["POST"])
+            )
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # 비동기 세션은 이벤트 루프에 묶이므로 루프 안에서 지연 생성
+        self._aio_session: Optional[aiohttp.ClientSession] = None
+    
+    def _headers(self) -> Dict[str, str]:
+        """요청 헤더"""
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        payload = {
+    
+    def _build_payload(self, images: List[ImageInput], prompt: str, max_edge: Optional[int]) -> Dict[str, Any]:
+        """Vision 요청 본문 구성 (이미지 여러 장은 순서대로 image_url 항목으로 추가)"""
+        return {
             "model": self.vision_model,
             "messages": [
                 {
@@ -94,20 +390,36 @@ class DeepSeekProvider(LLMProvider):
                     "role": "user",
                     "content": [
                         {"type": "text", "text": prompt},
-                        {
-                            "type": "image_url",
-                            "image_url": {"url": f"data:image/png;base64,{b64_image}"}
-                        }
+                        *(
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": self._image_data_url(image, max_edge)}
+                            }
+                            for image in images
+                        )
                     ]
                 }
             ],
             "temperature": 0
         }
-        
+    
+    @_cached
+    def analyze_image(self, image: ImageInput, prompt: str,
+                      max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """DeepSeek Vision API로 이미지 분석"""
+        return self._post(self._build_payload([image], prompt, max_edge))
+    
+    @_cached
+    def analyze_images(self, images: List[ImageInput], prompt: str,
+                       max_edge: Optional[int] = None) -> str:
+        """DeepSeek Vision API로 여러 이미지를 한 번에 분석"""
+        return self._post(self._build_payload(images, prompt, max_edge))
+    
+    def _post(self, payload: Dict[str, Any]) -> str:
+        """Chat Completions 호출"""
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
                 json=payload,
                 timeout=120
             )
@@ -116,12 +428,51 @@ class DeepSeekProvider(LLMProvider):
             return data["choices"][0]["message"]["content"]
         except Exception as e:
             print(f"⚠️ DeepSeek API 호출 실패: {e}")
-            return '{"objects": []}'
+            return EMPTY_RESPONSE
+    
+    @_cached_async
+    async def analyze_image_async(self, image: ImageInput, prompt: str,
+                                  max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
+        """DeepSeek Vision API로 이미지 분석 (비동기)"""
+        # 리사이즈/JPEG 인코딩/base64는 이벤트 루프 밖에서 수행 (Pillow는 GIL 해제)
+        payload = await asyncio.to_thread(self._build_payload, [image], prompt, max_edge)
+        return await self._post_async(payload)
+    
+    @_cached_async
+    async def analyze_images_async(self, images: List[ImageInput], prompt: str,
+                                   max_edge: Optional[int] = None) -> str:
+        """DeepSeek Vision API로 여러 이미지를 한 번에 분석 (비동기)"""
+        payload = await asyncio.to_thread(self._build_payload, images, prompt, max_edge)
+        return await self._post_async(payload)
+    
+    async def _post_async(self, payload: Dict[str, Any]) -> str:
+        """Chat Completions 호출 (비동기)"""
+        if self._aio_session is None or self._aio_session.closed:
+            self._aio_session = aiohttp.ClientSession(
+                headers=self._headers(),
+                timeout=aiohttp.ClientTimeout(total=120)
+            )
+        
+        try:
+            async with self._aio_session.post(f"{self.base_url}/chat/completions", json=payload) as response:
+                response.raise_for_status()
+                data = await response.json()
+                return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            print(f"⚠️ DeepSeek API 호출 실패: {e}")
+            return EMPTY_RESPONSE
+    
+    async def aclose(self):
+        """비동기 세션 정리"""
+        if self._aio_session is not None:
+            await self._aio_session.close()
+            self._aio_session = None
 
 class MockProvider(LLMProvider):
     """테스트용 Mock 제공자"""
     
-    def analyze_image(self, image: Image.Image, prompt: str) -> str:
+    def analyze_image(self, image: ImageInput, prompt: str,
+                      max_edge: Optional[int] = DEFAULT_MAX_EDGE) -> str:
         """Mock 응답 반환"""
         # 간단한 Mock 응답
         return json.dumps({
@@ -1,6 +1,7 @@
 import os, json
 from typing import List, Dict, Any
 from io import BytesIO
+import numpy as np
 
 def to_labelstudio(items: List[dict]) -> dict:
     """
@@ -11,18 +12,25 @@ def to_labelstudio(items: List[dict]) -> dict:
     out = []
     for it in items:
         img_rel = os.path.basename(it["image_path"])
+        objs = it.get("objects", [])
         anns = []
-        for obj in it.get("objects", []):
-            x,y,w,h = obj["bbox"]
+        if objs:
+            # percent coords for all boxes at once (same x/W*100 order of ops as scalar code)
+            W, H = it["width"], it["height"]
+            arr = np.asarray([obj["bbox"] for obj in objs], dtype=np.float64)
+            norm = (arr / np.array([W, H, W, H], dtype=np.float64) * 100).tolist()
+        else:
+            norm = []
+        for obj, (x, y, w, h) in zip(objs, norm):
             anns.append({
                 "from_name":"label",
                 "to_name":"image",
                 "type":"rectanglelabels",
                 "value":{
-                    "x": x/it["width"]*100,
-                    "y": y/it["height"]*100,
-                    "width": w/it["width"]*100,
-                    "height": h/it["height"]*100,
+                    "x": x,
+                    "y": y,
+                    "width": w,
+                    "height": h,
                     "rectanglelabels":[obj["label"]],
                     "score": obj.get("score", None)
                 }
@@ -35,29 +43,22 @@ def to_labelstudio(items: List[dict]) -> dict:
 
 def to_yolo(items: List[dict], out_dir: str):
     os.makedirs(out_dir, exist_ok=True)
-    name_to_id = {}
-    next_id = 0
+    # class ids in first-appearance order, resolved once up front
+    name_to_id = {name: i for i, name in enumerate(dict.fromkeys(
+        obj["label"] for it in items for obj in it.get("objects", [])))}
     for it in items:
         w, h = it["width"], it["height"]
         label_path = os.path.join(out_dir, os.path.splitext(os.path.basename(it["image_path"]))[0] + ".txt")
         lines = []
         for obj in it.get("objects", []):
             x,y,bw,bh = obj["bbox"]
-            cx = (x + bw/2)/w
-            cy = (y + bh/2)/h
-            ww = bw/w
-            hh = bh/h
-            name = obj["label"]
-            if name not in name_to_id:
-                name_to_id[name] = next_id; next_id += 1
-            cls_id = name_to_id[name]
-            lines.append(f"{cls_id} {cx:.6f} {cy:.6f} {ww:.6f} {hh:.6f}")
-        with open(label_path,"w") as f:
-            f.write("\n".join(lines))
+            lines.append(f"{name_to_id[obj['label']]} {(x + bw/2)/w:.6f} {(y + bh/2)/h:.6f} {bw/w:.6f} {bh/h:.6f}")
+        # one write per file
+        with open(label_path, "wb") as f:
+            f.write("\n".join(lines).encode())
     # also export classes.txt
     with open(os.path.join(out_dir,"classes.txt"),"w") as f:
-        for name,_id in sorted(name_to_id.items(), key=lambda x:x[1]):
-            f.write(f"{name}\n")
+        f.write("".join(f"{name}\n" for name in name_to_id))
 
 def to_coco(items: List[dict]) -> dict:
     images, annotations, categories = [], [], []
@@ -69,7 +70,10 @@ def to_coco(items: List[dict]) -> dict:
             "width": it["width"],
             "height": it["height"]
         })
-        for ann_id, obj in enumerate(it.get("objects", []), start=len(annotations)+1):
+        objs = it.get("objects", [])
+        # areas for all boxes at once (int bboxes stay int)
+        areas = np.asarray([obj["bbox"] for obj in objs]).reshape(-1, 4)[:, 2:].prod(axis=1).tolist()
+        for ann_id, (obj, area) in enumerate(zip(objs, areas), start=len(annotations)+1):
             name = obj["label"]
             if name not in name_to_id:
                 name_to_id[name] = len(name_to_id)+1
@@ -80,7 +84,7 @@ def to_coco(items: List[dict]) -> dict:
                 "image_id": img_id,
                 "category_id": cid,
                 "bbox": [x,y,w,h],
-                "area": w*h,
+                "area": area,
                 "iscrowd": 0,
                 "score": obj.get("score", None)
             })
@@ -1,41 +1,98 @@
 from dotenv import load_dotenv ; load_dotenv()
 from pathlib import Path
-import os, json, hashlib, shutil
+import os, json, hashlib, shutil, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any
 from PIL import Image
 import requests
+from requests.adapters import HTTPAdapter
+from tqdm import tqdm
+try:
+    import orjson
+except ImportError:  # optional: faster save_json
+    orjson = None
 
 PROJECT_ROOT = Path(__file__).parent.parent
 
 def ensure_dir(p): os.makedirs(p, exist_ok=True)
 
-def download_images(url_list_path: str, out_dir: str = PROJECT_ROOT / "images"):
+def _fetch(session: requests.Session, url: str, out_dir: str) -> str:
+    h = hashlib.md5(url.encode()).hexdigest()[:10]
+    fn = os.path.join(out_dir, f"{h}.png")
+    if os.path.exists(fn): return fn
+    r = session.get(url, timeout=30)
+    r.raise_for_status()
+    # write to a temp file and rename so a partial download never looks complete
+    tmp = f"{fn}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as w:
+        w.write(r.content)
+    os.replace(tmp, fn)
+    return fn
+
+def download_images(url_list_path: str, out_dir: str = PROJECT_ROOT / "images", max_workers: int = 32):
     ensure_dir(out_dir)
     if not os.path.exists(url_list_path): return
     with open(url_list_path, "r", encoding="utf-8") as f:
-        for line in f:
-            url = line.strip()
-            if not url or url.startswith('#'): continue
-            h = hashlib.md5(url.encode()).hexdigest()[:10]
-            fn = os.path.join(out_dir, f"{h}.png")
-            if os.path.exists(fn): continue
-            r = requests.get(url, timeout=30)
-            r.raise_for_status()
-            with open(fn, "wb") as w:
-                w.write(r.content)
+        urls = [u for u in (line.strip() for line in f) if u and not u.startswith('#')]
+    urls = list(dict.fromkeys(urls))  # same URL -> same file, fetch once
+    # one pooled session shared by all workers (reuses TCP/TLS connections)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    with session, ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futs = [ex.submit(_fetch, session, url, out_dir) for url in urls]
+        for fut in tqdm(as_completed(futs), total=len(futs), desc="download"):
+            fut.result()
+
+IMAGE_EXTS = {".png",".jpg",".jpeg",".webp",".bmp"}
 
 def list_images(dir_path: str) -> List[str]:
-    exts = (".png",".jpg",".jpeg",".webp",".bmp")
+    # iterative scandir walk: one syscall per directory, d_type for file/dir
+    # (like os.walk: symlinked dirs are not descended, unreadable dirs are skipped)
     files = []
-    for root, _, fs in os.walk(dir_path):
-        for f in fs:
-            if f.lower().endswith(exts):
-                files.append(os.path.join(root, f))
-    return sorted(files)
+    stack = [dir_path]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for e in it:
+                name = e.name
+                if e.is_dir():
+                    if not e.is_symlink():
+                        stack.append(e.path)
+                elif name[name.rfind('.'):].lower() in IMAGE_EXTS:
+                    files.append(e.path)
+    files.sort()
+    return files
 
-def load_image(path: str) -> Image.Image:
-    return Image.open(path).convert("RGB")
+def load_image(path: str, max_edge: int = None) -> Image.Image:
+    """
+    Load as RGB. With max_edge, JPEGs are decoded at reduced scale (draft) and the
+    result is shrunk so its long edge <= max_edge; im.info["original_size"] keeps
+    the on-disk size so callers can map coordinates back.
+    """
+    im = Image.open(path)
+    original_size = im.size
+    if max_edge:
+        if im.format == "JPEG":
+            # draft needs both sides >= the request, so ask for the aspect-preserving target
+            scale = min(1.0, max_edge / max(original_size))
+            im.draft("RGB", (int(original_size[0] * scale), int(original_size[1] * scale)))
+        im = im.convert("RGB")
+        if max(im.size) > max_edge:
+            im.thumbnail((max_edge, max_edge), Image.LANCZOS)
+    else:
+        im = im.convert("RGB")
+    im.info["original_size"] = original_size
+    return im
 
 def save_json(path: str, data: Any):
+    if orjson is not None:
+        with open(path,"wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        return
     with open(path,"w",encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,66 @@
+import os, json, hashlib, threading
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+from PIL import Image
+
+class LLMCache:
+    """
+    On-disk + in-memory cache of raw LLM responses.
+    Key covers the decoded pixels (no re-encoding), prompt, model and send size,
+    so identical images/crops are answered without another API call.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        # misses raise FileNotFoundError, which lru_cache does not memoize
+        self._read = lru_cache(maxsize=4096)(self._read)
+
+    @staticmethod
+    def _header(image: Union[Image.Image, bytes]) -> str:
+        if isinstance(image, bytes):  # already-encoded image
+            return f"bytes{len(image)}"
+        return f"{image.mode}:{image.size[0]}x{image.size[1]}"
+
+    @staticmethod
+    def _payload(image: Union[Image.Image, bytes]) -> bytes:
+        return image if isinstance(image, bytes) else image.tobytes()
+
+    @classmethod
+    def key(cls, image: Union[Image.Image, bytes, Sequence[Union[Image.Image, bytes]]], prompt: str,
+            model: str, max_edge: Optional[int]) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        if isinstance(image, (Image.Image, bytes)):
+            h.update(f"{cls._header(image)}:{max_edge}:{model}\0".encode())
+            h.update(prompt.encode())
+            h.update(b"\0")
+            h.update(cls._payload(image))
+            return h.hexdigest()
+        # multi-image request: every image's header + pixels, in order
+        h.update(f"batch{len(image)}:{max_edge}:{model}\0".encode())
+        h.update(prompt.encode())
+        for im in image:
+            h.update(f"\0{cls._header(im)}\0".encode())
+            h.update(cls._payload(im))
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> str:
+        with open(self._path(key), "r", encoding="utf-8") as f:
+            return json.load(f)["response"]
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            return self._read(key)
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, response: str):
+        path = self._path(key)
+        # per-thread tmp name: async callers write from worker threads
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"response": response}, f, ensure_ascii=False)
+        os.replace(tmp, path)
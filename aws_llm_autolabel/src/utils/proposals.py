@@ -1,26 +1,50 @@
 import cv2, numpy as np
 from typing import List, Tuple
 
-def sliding_windows(h, w, win=96, stride=64):
-    for y in range(0, max(1, h - win), stride):
-        for x in range(0, max(1, w - win), stride):
-            yield x, y, win, win
+def sliding_windows(h, w, win=96, stride=64) -> np.ndarray:
+    """(N,4) int32 [x,y,win,win] grid, row-major (y outer, x inner)"""
+    ys = np.arange(0, max(1, h - win), stride, dtype=np.int32)
+    xs = np.arange(0, max(1, w - win), stride, dtype=np.int32)
+    gx, gy = np.meshgrid(xs, ys)
+    return np.stack([gx.ravel(), gy.ravel(),
+                     np.full(gx.size, win, np.int32), np.full(gx.size, win, np.int32)], axis=1)
 
 def contour_proposals(img, min_area=800, max_area=50000):
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    # accepts a ready single-channel image to skip the color conversion
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     e = cv2.Canny(gray, 50, 150)
     cnts, _ = cv2.findContours(e, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    boxes = []
-    for c in cnts:
-        x,y,w,h = cv2.boundingRect(c)
-        area = w*h
-        if min_area <= area <= max_area:
-            boxes.append((x,y,w,h))
-    return boxes
+    # boundingRect stays per-contour (OpenCV call); area filter is one vectorized mask
+    rects = np.array([cv2.boundingRect(c) for c in cnts], dtype=np.int32).reshape(-1, 4)
+    area = rects[:, 2].astype(np.int64) * rects[:, 3]
+    return rects[(area >= min_area) & (area <= max_area)]
 
-def propose_regions(img_bgr) -> List[Tuple[int,int,int,int]]:
+def nms(boxes_xywh, iou_thresh=0.4) -> np.ndarray:
+    """Greedy NMS, larger boxes win; kept boxes are returned in input order"""
+    boxes = np.asarray(boxes_xywh, dtype=np.int32).reshape(-1, 4)
+    if len(boxes) == 0:
+        return boxes
+    x1, y1 = boxes[:, 0].astype(np.float64), boxes[:, 1].astype(np.float64)
+    w, h = boxes[:, 2].astype(np.float64), boxes[:, 3].astype(np.float64)
+    x2, y2 = x1 + w, y1 + h
+    areas = w * h
+    order = np.argsort(-areas, kind="stable")
+    keep = []
+    while order.size:
+        i, rest = order[0], order[1:]
+        keep.append(i)
+        iw = np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])
+        ih = np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])
+        inter = np.clip(iw, 0, None) * np.clip(ih, 0, None)
+        iou = inter / (areas[i] + areas[rest] - inter)
+        order = rest[iou <= iou_thresh]
+    return boxes[np.sort(keep)]
+
+def propose_regions(img_bgr, iou_thresh=0.4) -> np.ndarray:
+    """(N,4) int32 array of [x,y,w,h] boxes; img_bgr may also be a grayscale image"""
     h, w = img_bgr.shape[:2]
-    boxes = list(sliding_windows(h, w))  # coarse proposals
-    boxes += contour_proposals(img_bgr)
-    # optional: NMS to reduce overlaps
-    return boxes
+    sliding = sliding_windows(h, w)  # coarse proposals
+    contour = np.asarray(contour_proposals(img_bgr), dtype=np.int32).reshape(-1, 4)
+    boxes = np.vstack([sliding, contour])
+    # NMS to reduce overlaps (each box is one LLM call)
+    return nms(boxes, iou_thresh)
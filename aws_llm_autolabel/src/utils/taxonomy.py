@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from rapidfuzz import process, fuzz
 
 @dataclass
@@ -8,6 +9,14 @@ class Taxonomy:
     canonical_to_aliases: Dict[str, List[str]]
     alias_to_canonical: Dict[str, str]
     names: List[str]
+    # fuzzy results keyed by the lowercased input (LLM outputs repeat a lot)
+    normalize_cache_size: int = field(default=100_000, repr=False, compare=False)
+    _fuzzy_cache: Dict[str, Optional[Tuple[str, float]]] = field(default_factory=dict, repr=False, compare=False)
+    # fuzzy-match candidates, built once instead of per call
+    _alias_keys: List[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._alias_keys = list(self.alias_to_canonical.keys())
 
     @classmethod
     def from_csv(cls, path: str) -> "Taxonomy":
@@ -31,41 +40,79 @@ class Taxonomy:
                 alias_col = c
                 break
 
-        canonical_to_aliases = {}
-        alias_to_canonical = {}
+        canon = df[name_col].map(str).str.strip()
+        # (row, canonical, key) pairs: each canonical maps to itself plus its '|' aliases
+        pairs = pd.DataFrame({"canon": canon, "alias": canon})
+        if alias_col:
+            aliases = pd.DataFrame({"canon": canon, "alias": df[alias_col].fillna("").astype(str).str.split("|")})
+            aliases = aliases.explode("alias")
+            aliases["alias"] = aliases["alias"].str.strip()
+            aliases = aliases[aliases["alias"] != ""]
+            # stable sort keeps row order, so later rows win like the old row loop
+            pairs = pd.concat([pairs, aliases]).sort_index(kind="stable")
+
+        alias_to_canonical = dict(zip(pairs["alias"].str.lower(), pairs["canon"]))
 
-        for _, row in df.iterrows():
-            canon = str(row[name_col]).strip()
-            aliases = []
-            if alias_col and not pd.isna(row[alias_col]):
-                aliases = [a.strip() for a in str(row[alias_col]).split("|") if a.strip()]
-            all_keys = set([canon] + aliases)
-            canonical_to_aliases[canon] = list(all_keys)
-            for k in all_keys:
-                alias_to_canonical[k.lower()] = canon
+        # a canonical repeated across rows keeps only its last row's aliases
+        last = pairs[~canon.duplicated(keep="last").reindex(pairs.index).to_numpy()]
+        grouped = last.drop_duplicates().groupby("canon", sort=False)["alias"].apply(list).to_dict()
+        canonical_to_aliases = {c: grouped[c] for c in dict.fromkeys(canon)}
 
         names = list(canonical_to_aliases.keys())
         return cls(canonical_to_aliases, alias_to_canonical, names)
 
     def normalize(self, s: str) -> Tuple[str, float]:
-        """Map arbitrary text to canonical via fuzzy matching + alias map."""
+        """Map arbitrary text to canonical via fuzzy matching + alias map (memoized)."""
         key = s.strip().lower()
         if key in self.alias_to_canonical:
             return self.alias_to_canonical[key], 1.0
-        # fuzzy to all aliases
-        best = process.extractOne(
-            key,
-            list(self.alias_to_canonical.keys()),
-            scorer=fuzz.WRatio
-        )
-        if best:
-            alias, score, _ = best
-            return self.alias_to_canonical[alias], score/100.0
-        # fallback to canonical names
-        best2 = process.extractOne(
-            key, self.names, scorer=fuzz.WRatio
-        )
-        if best2:
-            name, score, _ = best2
-            return name, score/100.0
-        return s, 0.0
+        if key in self._fuzzy_cache:
+            result = self._fuzzy_cache[key]
+        else:
+            result = self._fuzzy_match([key])[0]
+            self._remember(key, result)
+        return result or (s, 0.0)
+
+    def normalize_batch(self, queries: List[str]) -> List[Tuple[str, float]]:
+        """normalize() for many strings; all fuzzy misses are scored in one cdist call."""
+        keys = [s.strip().lower() for s in queries]
+        misses = list(dict.fromkeys(
+            k for k in keys if k not in self.alias_to_canonical and k not in self._fuzzy_cache
+        ))
+        if misses:
+            for key, result in zip(misses, self._fuzzy_match(misses)):
+                self._remember(key, result)
+
+        results = []
+        for s, key in zip(queries, keys):
+            if key in self.alias_to_canonical:
+                results.append((self.alias_to_canonical[key], 1.0))
+            else:
+                results.append(self._fuzzy_cache.get(key) or (s, 0.0))
+        return results
+
+    def _fuzzy_match(self, keys: List[str]) -> List[Optional[Tuple[str, float]]]:
+        # fuzzy to all aliases, falling back to canonical names
+        choices = self._alias_keys or self.names
+        if not choices:
+            return [None] * len(keys)
+        if len(keys) == 1:
+            # extractOne prunes with a rising score cutoff, cheaper than a 1-row matrix
+            _, score, j = process.extractOne(keys[0], choices, scorer=fuzz.WRatio)
+            best, best_scores = [j], [score]
+        else:
+            # one threaded C++ matrix for the whole batch; argmax picks the first best like extractOne
+            scores = process.cdist(keys, choices, scorer=fuzz.WRatio, dtype=np.float64, workers=-1)
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(keys)), best]
+        to_canonical = self.alias_to_canonical if self._alias_keys else None
+        return [
+            (to_canonical[choices[j]] if to_canonical else choices[j], float(score) / 100.0)
+            for j, score in zip(best, best_scores)
+        ]
+
+    def _remember(self, key: str, result: Optional[Tuple[str, float]]):
+        if len(self._fuzzy_cache) >= self.normalize_cache_size:
+            # evict the oldest entry (dicts keep insertion order)
+            del self._fuzzy_cache[next(iter(self._fuzzy_cache))]
+        self._fuzzy_cache[key] = result
@@ -78,11 +78,13 @@ class AWSTaxonomy(BaseTaxonomy):
                     break
 
             c2a, a2c = {}, {}
-            for _, r in df.iterrows():
-                canon = str(r[name_col]).strip()
+            # iterrows는 행마다 Series를 만들므로 필요한 두 열만 튜플로 순회
+            cols = [name_col] + ([alias_col] if alias_col else [])
+            for r in df[cols].itertuples(index=False, name=None):
+                canon = str(r[0]).strip()
                 aliases = []
-                if alias_col and pd.notna(r[alias_col]):
-                    aliases = [a.strip() for a in str(r[alias_col]).split("|") if a.strip()]
+                if alias_col and pd.notna(r[1]):
+                    aliases = [a.strip() for a in str(r[1]).split("|") if a.strip()]
                 keys = set([canon] + aliases)
                 c2a[canon] = list(keys)
                 for k in keys:
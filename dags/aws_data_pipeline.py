@@ -12,8 +12,12 @@ from airflow.decorators import task
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+# aws_data_collectors imports its collectors as a top-level package
+COLLECTORS_ROOT = ROOT / "aws_data_collectors"
+if str(COLLECTORS_ROOT) not in sys.path:
+    sys.path.insert(0, str(COLLECTORS_ROOT))
 
-from aws_icons_parser.aws_icons_zip_to_mapping import generate_mapping
+from collectors.icon_collector import AWSIconCollector
 from aws_products_scraper.fetch_products import fetch_products
 from aws_service_boto3.export_service_codes import export_service_codes
 from aws_service_boto3.infer_from_models import infer_from_models
@@ -21,6 +25,21 @@ from aws_service_boto3.infer_from_models import infer_from_models
 
 default_args = {"retries": 1}
 
+ICONS_ZIP = ROOT / "Asset-Package.zip"
+ICONS_OUT = ROOT / "data" / "aws" / "icons"
+
+
+def generate_mapping() -> None:
+    """Parse the icon ZIP with the shared AWSIconCollector and write the mapping files."""
+    collector = AWSIconCollector()
+    mappings = collector.collect_icons(str(ICONS_ZIP))
+    ICONS_OUT.mkdir(parents=True, exist_ok=True)
+    collector.save_mappings(
+        mappings,
+        str(ICONS_OUT / "aws_icons_mapping.csv"),
+        str(ICONS_OUT / "aws_icons_mapping.json"),
+    )
+
 with DAG(
     dag_id="aws_data_pipeline",
     start_date=datetime(2025, 1, 1),